@@ -1,4 +1,26 @@
+# External Imports
+from importlib import import_module
+
 # Internal Imports
-from adapters.blobs import BlobAdapter, FileSystemBlobAdapter, S3BlobAdapter  # noqa
-from adapters.databases import DBAdapter, PostgreSQLAdapter, SQLiteAdapter  # noqa
-from adapters.queues import InMemQueueAdapter, QueueAdapter, RabbitMQAdapter  # noqa
+from adapters.registry import BLOB_ADAPTERS, DB_ADAPTERS, QUEUE_ADAPTERS, AdapterRegistry  # noqa
+
+# NOTE: Resolved on first access (PEP 562) so importing the package doesn't pull in every backend
+_LAZY_EXPORTS = {
+    "BlobAdapter": "adapters.blobs",
+    "FileSystemBlobAdapter": "adapters.blobs",
+    "S3BlobAdapter": "adapters.blobs",
+    "DIMENSIONS": "adapters.databases",
+    "ROLLUP_TABLES": "adapters.databases",
+    "DBAdapter": "adapters.databases",
+    "PostgreSQLAdapter": "adapters.databases",
+    "SQLiteAdapter": "adapters.databases",
+    "InMemQueueAdapter": "adapters.queues",
+    "QueueAdapter": "adapters.queues",
+    "RabbitMQAdapter": "adapters.queues",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_LAZY_EXPORTS[name]), name)
@@ -2,7 +2,6 @@
 import os
 from abc import ABC, abstractmethod
 
-import boto3
 from config import Config
 
 
@@ -23,10 +22,22 @@ class BlobAdapter(ABC):
     def save_data(self, file_name: str, data: bytes) -> None:
         pass
 
+    @abstractmethod
+    def get_size(self, file_name_with_path: str) -> int:
+        pass
+
+    @abstractmethod
+    def read_range(self, file_name_with_path: str, start: int, end: int) -> bytes:
+        """Read the raw bytes in [start, end) without loading the rest of the object."""
+        pass
+
 
 class S3BlobAdapter(BlobAdapter):
     def __init__(self, config: Config):
         super().__init__(config=config)
+        # NOTE: Imported here so only processes that actually talk to S3 pay for boto3
+        import boto3
+
         # NOTE: Assumption: Assumed IAM Role inside VPC or AWS envs already set in env
         self.s3 = boto3.client("s3")
 
@@ -44,6 +55,17 @@ class S3BlobAdapter(BlobAdapter):
         self.s3.put_object(Bucket=self.config.S3_BUCKET,
                            Key=file_name, Body=data)
 
+    def get_size(self, file_name_with_path: str) -> int:
+        response = self.s3.head_object(
+            Bucket=self.config.S3_BUCKET, Key=file_name_with_path)
+        return response["ContentLength"]
+
+    def read_range(self, file_name_with_path: str, start: int, end: int) -> bytes:
+        # NOTE: HTTP byte ranges are inclusive on both ends
+        response = self.s3.get_object(
+            Bucket=self.config.S3_BUCKET, Key=file_name_with_path, Range=f"bytes={start}-{end - 1}")
+        return response["Body"].read()
+
 
 class FileSystemBlobAdapter(BlobAdapter):
     def __init__(self, config: Config):
@@ -63,6 +85,14 @@ class FileSystemBlobAdapter(BlobAdapter):
         with open(file_path, "wb") as f:
             f.write(data)
 
+    def get_size(self, file_name_with_path: str) -> int:
+        return os.path.getsize(os.path.join(self.config.LOCAL_STORAGE_PATH, file_name_with_path))
+
+    def read_range(self, file_name_with_path: str, start: int, end: int) -> bytes:
+        with open(os.path.join(self.config.LOCAL_STORAGE_PATH, file_name_with_path), "rb") as file:
+            file.seek(start)
+            return file.read(end - start)
+
 
 if __name__ == "__main__":
     pass
@@ -1,16 +1,63 @@
 # External Imports
 from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from typing import Iterator
 
 from config import Config
-from sqlalchemy import create_engine, text
+from sqlalchemy import Row, bindparam, create_engine, inspect, text
+
+# Dimensions mapping the TEXT IDs of the source to the integer surrogate keys facts and aggregates are stored on
+# dimension: (table, surrogate key column, natural ID column)
+DIMENSIONS = {
+    "customer": ("DimCustomer", "CustomerKey", "CustomerID"),
+    "product": ("DimProduct", "ProductKey", "ProductID"),
+}
+# NOTE: Keeps every IN (...) list of a dimension lookup well under the bind parameter limit of each DB
+DIMENSION_LOOKUP_BATCH = 1000
+
+# Columns a SalesSummary made before the surrogate keys is missing
+SALES_SUMMARY_KEY_COLUMNS = ("SourceChunk", "CustomerKey", "ProductKey")
+
+# Rollups kept up to date as each chunk loads, keyed by (CustomerKey, ProductKey, Period)
+ROLLUP_TABLES = {"day": "SalesRollupDaily", "month": "SalesRollupMonthly"}
+
+# Indexes of every Orders partition
+# NOTE: Assuming query can be done on any column
+ORDER_INDEXES = {
+    "order_id": "OrderID",
+    "order_date": "OrderDate",
+    "customer_key": "CustomerKey",
+    "product_key": "ProductKey",
+    "quantity": "Quantity",
+    "unit_price": "UnitPrice",
+    "total_amount": "TotalAmount",
+    "customer_product": "CustomerKey, ProductKey",
+}
+
+
+def order_month(order_date) -> date:
+    """First day of the month an OrderDate (date or ISO string) falls in."""
+    return date.fromisoformat(str(order_date)[:10]).replace(day=1)
+
+
+def order_partition_name(month_start: date) -> str:
+    return f"Orders_{month_start:%Y%m}"
 
 
 class DBAdapter(ABC):
-    def __init__(self, config: Config):
+    # Dialect specific pieces, set by each concrete adapter
+    ENGINE_OPTIONS: dict = {}
+    EPOCH_NOW_SQL: str  # Current DB server time as unix seconds, so lease clocks don't depend on node clocks
+    ROW_LOCK_SQL: str  # Suffix for a "claim one row" sub-select
+    SURROGATE_KEY_SQL: str  # Column definition of an integer primary key the DB assigns on insert
+    PARTITION_LOCK_SQL: str  # Serialises Orders partition DDL between connections until the transaction ends
+
+    def __init__(self, config: Config, db_uri: str | None = None):
         self.config = config
         self.db_type = config.DB_TYPE
-        self.db_uri = config.DB_URI
-        self.engine = create_engine(self.db_uri)
+        self.db_uri = db_uri or config.DB_URI  # NOTE: Loader shards pass their own URI
+        self.engine = create_engine(self.db_uri, **self.ENGINE_OPTIONS)
+        self.order_partitions = set()  # Partitions known to exist, saves a round trip per chunk
 
     @abstractmethod
     def execute_query(self, query, params=None):
@@ -18,134 +65,446 @@ class DBAdapter(ABC):
             result = connection.execute(text(query), params)
             return result.fetchall()
 
+    @abstractmethod
+    def stream_query(self, query, params=None, batch_size: int = 1000) -> Iterator[Row]:
+        # NOTE: stream_results asks the driver for a server side cursor, rows arrive batch_size at a time
+        with self.engine.connect().execution_options(stream_results=True, yield_per=batch_size) as connection:
+            result = connection.execute(text(query), params)
+            yield from result
+
     @abstractmethod
     def create_tables(self):
-        with self.engine.connect() as connection:
-            # NOTE: This table can have a data retention policy of year so that,
-            # once aggregates are worked upon this data is auto-purged
-            # while the aggregates persist in the SalesSummary Table
+        with self.engine.begin() as connection:
+            # Creating the dimension tables, the UNIQUE natural ID is also what new keys conflict on
+            for table, key_column, id_column in DIMENSIONS.values():
+                connection.execute(
+                    text(
+                        f"""
+                        CREATE TABLE IF NOT EXISTS {table} (
+                            {key_column} {self.SURROGATE_KEY_SQL},
+                            {id_column} TEXT NOT NULL UNIQUE
+                        )
+                        """
+                    )
+                )
 
-            # Creating Orders table with indexed columns
+            # NOTE: Orders is range partitioned by month of OrderDate so that a data retention
+            # policy (e.g. a year) only has to drop whole partitions once aggregates are worked
+            # upon, while the aggregates persist in the SalesSummary and rollup tables
             connection.execute(
                 text(
                     """
-                    CREATE TABLE IF NOT EXISTS Orders (
-                        OrderID INTEGER PRIMARY KEY,
-                        OrderDate DATE,
-                        CustomerID TEXT,
-                        ProductID TEXT,
-                        Quantity INTEGER,
-                        UnitPrice REAL,
-                        TotalAmount REAL
+                    CREATE TABLE IF NOT EXISTS OrderPartitions (
+                        PartitionName TEXT PRIMARY KEY,
+                        RangeStart DATE NOT NULL,
+                        RangeEnd DATE NOT NULL
                     )
                     """
                 )
             )
-            # Create indexes separately
-            # NOTE: Assuming query can be done on any column
-            connection.execute(
-                text("CREATE INDEX IF NOT EXISTS idx_orders_order_id ON Orders (OrderID);"))
-            connection.execute(
-                text("CREATE INDEX IF NOT EXISTS idx_orders_order_date ON Orders (OrderDate);"))
-            connection.execute(text(
-                "CREATE INDEX IF NOT EXISTS idx_orders_customer_id ON Orders (CustomerID);"))
-            connection.execute(
-                text("CREATE INDEX IF NOT EXISTS idx_orders_product_id ON Orders (ProductID);"))
-            connection.execute(
-                text("CREATE INDEX IF NOT EXISTS idx_orders_quantity ON Orders (Quantity);"))
-            connection.execute(
-                text("CREATE INDEX IF NOT EXISTS idx_orders_unit_price ON Orders (UnitPrice);"))
-            connection.execute(text(
-                "CREATE INDEX IF NOT EXISTS idx_orders_total_amount ON Orders (TotalAmount);"))
-            connection.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS idx_orders_customer_product ON Orders (CustomerID, ProductID);")
-            )
+            connection.exec_driver_sql(self.PARTITION_LOCK_SQL)
+            self.create_orders_table(connection)
 
             # Creating SalesSummary table with indexed columns
             connection.execute(
                 text(
                     """
                     CREATE TABLE IF NOT EXISTS SalesSummary (
-                        CustomerID TEXT,
-                        ProductID TEXT,
+                        SourceChunk TEXT,
+                        CustomerKey INTEGER,
+                        ProductKey INTEGER,
                         TotalSales REAL
                     )
                     """
                 )
             )
+            # NOTE: An older SalesSummary is left as it is by IF NOT EXISTS, refuse it rather than fail on its columns
+            # Postgres reports the lower cased names
+            summary_columns = {column["name"].lower() for column in inspect(connection).get_columns("salessummary")}
+            missing_columns = [
+                column for column in SALES_SUMMARY_KEY_COLUMNS if column.lower() not in summary_columns]
+            if missing_columns:
+                raise RuntimeError(
+                    f"SalesSummary is missing {', '.join(missing_columns)}, it predates the surrogate keys. "
+                    "Migrate or drop it first"
+                )
             connection.execute(
                 text(
-                    "CREATE INDEX IF NOT EXISTS idx_sales_summary_customer_id ON SalesSummary (CustomerID);")
+                    "CREATE INDEX IF NOT EXISTS idx_sales_summary_customer_key ON SalesSummary (CustomerKey);")
             )
             connection.execute(
                 text(
-                    "CREATE INDEX IF NOT EXISTS idx_sales_summary_product_id ON SalesSummary (ProductID);")
+                    "CREATE INDEX IF NOT EXISTS idx_sales_summary_product_key ON SalesSummary (ProductKey);")
             )
             connection.execute(
                 text(
                     "CREATE INDEX IF NOT EXISTS idx_sales_summary_total_sales ON SalesSummary (TotalSales);")
             )
+            # NOTE: Rows of a leased chunk are unique per chunk, so a chunk loaded twice overwrites its own rows.
+            # Rows without a SourceChunk (the local queue pipeline) never conflict, NULLs are distinct
+            connection.execute(
+                text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_sales_summary_source_chunk "
+                    "ON SalesSummary (SourceChunk, CustomerKey, ProductKey);"
+                )
+            )
             connection.execute(
                 text(
-                    "CREATE INDEX IF NOT EXISTS idx_sales_summary_customer_product ON SalesSummary (CustomerID, ProductID);"
+                    "CREATE INDEX IF NOT EXISTS idx_sales_summary_customer_product ON SalesSummary (CustomerKey, ProductKey);"
                 )
             )
 
+            # Creating the rollup tables, Period is the day or the first day of the month
+            for grain, table in ROLLUP_TABLES.items():
+                connection.execute(
+                    text(
+                        f"""
+                        CREATE TABLE IF NOT EXISTS {table} (
+                            CustomerKey INTEGER NOT NULL,
+                            ProductKey INTEGER NOT NULL,
+                            Period DATE NOT NULL,
+                            TotalSales REAL NOT NULL,
+                            Quantity REAL NOT NULL,
+                            OrderCount INTEGER NOT NULL,
+                            PRIMARY KEY (CustomerKey, ProductKey, Period)
+                        )
+                        """
+                    )
+                )
+                # NOTE: The primary key already serves customer led lookups
+                connection.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS idx_rollup_{grain}_product_period ON {table} (ProductKey, Period);"))
+                connection.execute(
+                    text(f"CREATE INDEX IF NOT EXISTS idx_rollup_{grain}_period ON {table} (Period);"))
+
     @abstractmethod
-    def insert_order(self, order_data):
+    def fetch_dimension_keys(self, dimension, limit: int) -> list[tuple[str, int]]:
+        """(natural ID, surrogate key) pairs of up to `limit` members, the most recently added first."""
+        table, key_column, id_column = DIMENSIONS[dimension]
         with self.engine.connect() as connection:
+            result = connection.execute(
+                text(f"SELECT {id_column}, {key_column} FROM {table} ORDER BY {key_column} DESC LIMIT :limit"),
+                {"limit": limit},
+            )
+            return [tuple(row) for row in result]
+
+    @abstractmethod
+    def ensure_dimension_keys(self, dimension, natural_ids) -> dict[str, int]:
+        """Add the natural IDs a dimension doesn't hold yet and return the surrogate key of every one of them."""
+        table, key_column, id_column = DIMENSIONS[dimension]
+        # Sorted so concurrent loaders take the unique index locks in the same order and can't deadlock
+        natural_ids = sorted(natural_ids)
+        surrogate_keys = {}
+        with self.engine.begin() as connection:
+            for batch_start in range(0, len(natural_ids), DIMENSION_LOOKUP_BATCH):
+                batch = natural_ids[batch_start:batch_start + DIMENSION_LOOKUP_BATCH]
+                # NOTE: Whoever inserts an ID first assigns its key, everyone else reads that key back
+                connection.execute(
+                    text(
+                        f"INSERT INTO {table} ({id_column}) VALUES (:natural_id) "
+                        f"ON CONFLICT ({id_column}) DO NOTHING"
+                    ),
+                    [{"natural_id": natural_id} for natural_id in batch],
+                )
+                result = connection.execute(
+                    text(f"SELECT {id_column}, {key_column} FROM {table} WHERE {id_column} IN :natural_ids").bindparams(
+                        bindparam("natural_ids", expanding=True)),
+                    {"natural_ids": batch},
+                )
+                surrogate_keys.update((natural_id, surrogate_key) for natural_id, surrogate_key in result)
+        return surrogate_keys
+
+    @abstractmethod
+    def create_orders_table(self, connection):
+        pass
+
+    @abstractmethod
+    def create_order_partition(self, connection, partition, range_start: date, range_end: date):
+        pass
+
+    @abstractmethod
+    def drop_order_partition(self, connection, partition):
+        pass
+
+    def create_order_indexes(self, connection, table):
+        for index_name, columns in ORDER_INDEXES.items():
+            connection.execute(
+                text(f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_{index_name} ON {table} ({columns});"))
+
+    @abstractmethod
+    def ensure_order_partition(self, month_start: date) -> str:
+        partition = order_partition_name(month_start)
+        if partition in self.order_partitions:
+            return partition
+
+        range_end = (month_start + timedelta(days=32)).replace(day=1)
+        with self.engine.begin() as connection:
+            # NOTE: Loaders racing to the same month queue up here, whoever comes second finds it in place
+            connection.exec_driver_sql(self.PARTITION_LOCK_SQL)
             connection.execute(
                 text(
                     """
-                INSERT INTO Orders (OrderID, OrderDate, CustomerID, ProductID, Quantity, UnitPrice, TotalAmount)
-                VALUES (:OrderID, :OrderDate, :CustomerID, :ProductID, :Quantity, :UnitPrice, :TotalAmount)
+                INSERT INTO OrderPartitions (PartitionName, RangeStart, RangeEnd)
+                VALUES (:PartitionName, :RangeStart, :RangeEnd)
+                ON CONFLICT (PartitionName) DO NOTHING
             """
                 ),
-                order_data,
+                {"PartitionName": partition, "RangeStart": month_start.isoformat(), "RangeEnd": range_end.isoformat()},
             )
+            self.create_order_partition(connection, partition, month_start, range_end)
+        self.order_partitions.add(partition)
+        return partition
+
+    @abstractmethod
+    def drop_order_partitions_before(self, cutoff: date) -> list[str]:
+        """Drop every partition that ends on or before the cutoff, this is the Orders retention policy."""
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(self.PARTITION_LOCK_SQL)
+            partitions = connection.execute(
+                text("SELECT PartitionName FROM OrderPartitions WHERE RangeEnd <= :cutoff ORDER BY RangeStart"),
+                {"cutoff": cutoff.isoformat()},
+            ).scalars().all()
+            for partition in partitions:
+                connection.execute(
+                    text("DELETE FROM OrderPartitions WHERE PartitionName = :partition"), {"partition": partition})
+                self.drop_order_partition(connection, partition)
+        self.order_partitions.difference_update(partitions)
+        return partitions
+
+    def write_orders(self, connection, partition, orders):
+        connection.execute(
+            text(
+                f"""
+            INSERT INTO {partition} (OrderID, OrderDate, CustomerKey, ProductKey, Quantity, UnitPrice, TotalAmount)
+            VALUES (:OrderID, :OrderDate, :CustomerKey, :ProductKey, :Quantity, :UnitPrice, :TotalAmount)
+        """
+            ),
+            orders,
+        )
+
+    def write_rollups(self, connection, grain, rollup_rows):
+        if not rollup_rows:
+            return
+        # Sorted so concurrent loaders take row locks in the same order and can't deadlock
+        rollup_rows = sorted(rollup_rows, key=lambda row: (
+            row["CustomerKey"], row["ProductKey"], row["Period"]))
+        table = ROLLUP_TABLES[grain]
+        connection.execute(
+            text(
+                f"""
+            INSERT INTO {table} (CustomerKey, ProductKey, Period, TotalSales, Quantity, OrderCount)
+            VALUES (:CustomerKey, :ProductKey, :Period, :TotalSales, :Quantity, :OrderCount)
+            ON CONFLICT (CustomerKey, ProductKey, Period) DO UPDATE SET
+                TotalSales = {table}.TotalSales + excluded.TotalSales,
+                Quantity = {table}.Quantity + excluded.Quantity,
+                OrderCount = {table}.OrderCount + excluded.OrderCount
+        """
+            ),
+            rollup_rows,
+        )
+
+    @abstractmethod
+    def insert_order(self, order_data, rollups=None):
+        partition = self.ensure_order_partition(
+            order_month(order_data["OrderDate"]))
+        self.insert_orders(partition, [order_data], rollups=rollups)
+
+    @abstractmethod
+    def insert_orders(self, partition, orders, rollups=None):
+        """Orders of one month go straight into their partition in a single batch, with their rollup rows by grain."""
+        # NOTE: Rollups commit or roll back with their orders, a retried chunk never counts an order twice or not at all
+        try:
+            with self.engine.begin() as connection:
+                self.write_orders(connection, partition, orders)
+                for grain, rollup_rows in (rollups or {}).items():
+                    self.write_rollups(connection, grain, rollup_rows)
+        except Exception:
+            # NOTE: The partition may have been dropped since it was cached, e.g. by another node's retention purge.
+            # Forgetting it makes the next ensure_order_partition check the catalog and create it again
+            self.order_partitions.discard(partition)
+            raise
 
     @abstractmethod
     def insert_sales_summary(self, summary_data):
-        with self.engine.connect() as connection:
+        with self.engine.begin() as connection:
             connection.execute(
                 text(
                     """
-                INSERT INTO SalesSummary (CustomerID, ProductID, TotalSales)
-                VALUES (:CustomerID, :ProductID, :TotalSales)
+                INSERT INTO SalesSummary (SourceChunk, CustomerKey, ProductKey, TotalSales)
+                VALUES (:SourceChunk, :CustomerKey, :ProductKey, :TotalSales)
+                ON CONFLICT (SourceChunk, CustomerKey, ProductKey) DO UPDATE SET TotalSales = excluded.TotalSales
             """
                 ),
                 summary_data,
             )
 
+    @abstractmethod
+    def upsert_rollups(self, grain, rollup_rows):
+        with self.engine.begin() as connection:
+            self.write_rollups(connection, grain, rollup_rows)
+
 
 class SQLiteAdapter(DBAdapter):
+    # NOTE: Several worker processes may share one SQLite file, wait for the write lock instead of failing
+    ENGINE_OPTIONS = {"connect_args": {"timeout": 30}}
+    EPOCH_NOW_SQL = "((julianday('now') - 2440587.5) * 86400.0)"
+    ROW_LOCK_SQL = ""  # SQLite serialises writers, the claiming UPDATE is already exclusive
+    SURROGATE_KEY_SQL = "INTEGER PRIMARY KEY"  # An alias of the rowid, assigned on insert
+    # NOTE: pysqlite runs DDL outside of any transaction unless one is opened explicitly, this takes the
+    # database write lock up front so the partition table, catalog row and view change together
+    PARTITION_LOCK_SQL = "BEGIN IMMEDIATE"
+
+    # NOTE: SQLite has no native partitioning, every month is its own table and Orders is a
+    # UNION ALL view over them, rebuilt from OrderPartitions whenever a partition is added or dropped.
+    # OrderID is only unique within its month here.
+    def create_orders_table(self, connection):
+        existing = connection.execute(text("SELECT type FROM sqlite_master WHERE name = 'Orders'")).scalar()
+        if existing == "table":
+            raise RuntimeError("Orders is an unpartitioned table, move its rows into monthly partitions first")
+        self.rebuild_orders_view(connection)
+
+    def create_order_partition(self, connection, partition, range_start: date, range_end: date):
+        connection.execute(
+            text(
+                f"""
+                CREATE TABLE IF NOT EXISTS {partition} (
+                    OrderID INTEGER PRIMARY KEY,
+                    OrderDate DATE NOT NULL CHECK (OrderDate >= '{range_start}' AND OrderDate < '{range_end}'),
+                    CustomerKey INTEGER,
+                    ProductKey INTEGER,
+                    Quantity INTEGER,
+                    UnitPrice REAL,
+                    TotalAmount REAL
+                )
+                """
+            )
+        )
+        self.create_order_indexes(connection, partition)
+        self.rebuild_orders_view(connection)
+
+    def drop_order_partition(self, connection, partition):
+        connection.execute(text(f"DROP TABLE IF EXISTS {partition}"))
+        self.rebuild_orders_view(connection)
+
+    def rebuild_orders_view(self, connection):
+        partitions = connection.execute(text("SELECT PartitionName FROM OrderPartitions")).scalars().all()
+        columns = "OrderID, OrderDate, CustomerKey, ProductKey, Quantity, UnitPrice, TotalAmount"
+        selects = [f"SELECT {columns} FROM {partition}" for partition in sorted(partitions)] or [
+            "SELECT NULL AS OrderID, NULL AS OrderDate, NULL AS CustomerKey, NULL AS ProductKey, "
+            "NULL AS Quantity, NULL AS UnitPrice, NULL AS TotalAmount WHERE 0"
+        ]
+        connection.execute(text("DROP VIEW IF EXISTS Orders"))
+        connection.execute(text("CREATE VIEW Orders AS " + " UNION ALL ".join(selects)))
+
     def execute_query(self, query, params=None):
         return super().execute_query(query=query, params=params)
 
+    def stream_query(self, query, params=None, batch_size: int = 1000) -> Iterator[Row]:
+        return super().stream_query(query=query, params=params, batch_size=batch_size)
+
     def create_tables(self):
         return super().create_tables()
 
-    def insert_order(self, order_data):
-        return super().insert_order(order_data=order_data)
+    def fetch_dimension_keys(self, dimension, limit: int) -> list[tuple[str, int]]:
+        return super().fetch_dimension_keys(dimension=dimension, limit=limit)
+
+    def ensure_dimension_keys(self, dimension, natural_ids) -> dict[str, int]:
+        return super().ensure_dimension_keys(dimension=dimension, natural_ids=natural_ids)
+
+    def ensure_order_partition(self, month_start: date) -> str:
+        return super().ensure_order_partition(month_start=month_start)
+
+    def drop_order_partitions_before(self, cutoff: date) -> list[str]:
+        return super().drop_order_partitions_before(cutoff=cutoff)
+
+    def insert_order(self, order_data, rollups=None):
+        return super().insert_order(order_data=order_data, rollups=rollups)
+
+    def insert_orders(self, partition, orders, rollups=None):
+        return super().insert_orders(partition=partition, orders=orders, rollups=rollups)
 
     def insert_sales_summary(self, summary_data):
         return super().insert_sales_summary(summary_data=summary_data)
 
+    def upsert_rollups(self, grain, rollup_rows):
+        return super().upsert_rollups(grain=grain, rollup_rows=rollup_rows)
+
 
 class PostgreSQLAdapter(DBAdapter):
+    EPOCH_NOW_SQL = "EXTRACT(EPOCH FROM clock_timestamp())"
+    ROW_LOCK_SQL = "FOR UPDATE SKIP LOCKED"
+    SURROGATE_KEY_SQL = "INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY"
+    PARTITION_LOCK_SQL = "LOCK TABLE OrderPartitions IN EXCLUSIVE MODE"  # Readers of the catalog aren't blocked
+
+    def create_orders_table(self, connection):
+        existing = connection.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass('orders')")).scalar()
+        if existing is not None and existing != "p":
+            raise RuntimeError("Orders is an unpartitioned table, move its rows into monthly partitions first")
+
+        # NOTE: The partition key has to be part of the primary key on a partitioned table
+        connection.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS Orders (
+                    OrderID INTEGER NOT NULL,
+                    OrderDate DATE NOT NULL,
+                    CustomerKey INTEGER,
+                    ProductKey INTEGER,
+                    Quantity INTEGER,
+                    UnitPrice REAL,
+                    TotalAmount REAL,
+                    PRIMARY KEY (OrderID, OrderDate)
+                ) PARTITION BY RANGE (OrderDate)
+                """
+            )
+        )
+        # Indexes on the parent are created on every partition as it is attached
+        self.create_order_indexes(connection, "Orders")
+
+    def create_order_partition(self, connection, partition, range_start: date, range_end: date):
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF Orders "
+                f"FOR VALUES FROM ('{range_start}') TO ('{range_end}')"
+            )
+        )
+
+    def drop_order_partition(self, connection, partition):
+        connection.execute(text(f"DROP TABLE IF EXISTS {partition}"))
+
     def execute_query(self, query, params=None):
         return super().execute_query(query=query, params=params)
 
+    def stream_query(self, query, params=None, batch_size: int = 1000) -> Iterator[Row]:
+        return super().stream_query(query=query, params=params, batch_size=batch_size)
+
     def create_tables(self):
         return super().create_tables()
 
-    def insert_order(self, order_data):
-        return super().insert_order(order_data=order_data)
+    def fetch_dimension_keys(self, dimension, limit: int) -> list[tuple[str, int]]:
+        return super().fetch_dimension_keys(dimension=dimension, limit=limit)
+
+    def ensure_dimension_keys(self, dimension, natural_ids) -> dict[str, int]:
+        return super().ensure_dimension_keys(dimension=dimension, natural_ids=natural_ids)
+
+    def ensure_order_partition(self, month_start: date) -> str:
+        return super().ensure_order_partition(month_start=month_start)
+
+    def drop_order_partitions_before(self, cutoff: date) -> list[str]:
+        return super().drop_order_partitions_before(cutoff=cutoff)
+
+    def insert_order(self, order_data, rollups=None):
+        return super().insert_order(order_data=order_data, rollups=rollups)
+
+    def insert_orders(self, partition, orders, rollups=None):
+        return super().insert_orders(partition=partition, orders=orders, rollups=rollups)
 
     def insert_sales_summary(self, summary_data):
         return super().insert_sales_summary(summary_data=summary_data)
 
+    def upsert_rollups(self, grain, rollup_rows):
+        return super().upsert_rollups(grain=grain, rollup_rows=rollup_rows)
+
 
 if __name__ == "__main__":
     pass
@@ -2,7 +2,6 @@
 from abc import ABC, abstractmethod
 from queue import Queue
 
-import pika  # RabbitMQ
 from config import Config
 
 
@@ -54,6 +53,9 @@ class InMemQueueAdapter(QueueAdapter):
 class RabbitMQAdapter(QueueAdapter):
     def __init__(self, config: Config):
         super().__init__(config=config)
+        # NOTE: Imported here so only processes that actually talk to RabbitMQ pay for pika
+        import pika  # RabbitMQ
+
         self.connection = pika.BlockingConnection(
             pika.ConnectionParameters("localhost"))
         self.channels = {}
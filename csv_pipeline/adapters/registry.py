@@ -0,0 +1,72 @@
+# External Imports
+from importlib import import_module
+from importlib.metadata import entry_points
+
+
+class AdapterRegistry:
+    """
+    Maps adapter names (the QUEUE_TYPE / STORAGE_TYPE / DB_TYPE values) to adapter classes, importing lazily.
+
+    Built in adapters are registered as "module:Class" strings and only imported the first time their name is
+    resolved, so a process never pays for backends (boto3, pika, SQLAlchemy...) it doesn't use. Third party
+    adapters are discovered through the registry's entry point group, e.g. in their pyproject.toml:
+
+        [project.entry-points."csv_pipeline.db_adapters"]
+        mysql = "my_package.adapters:MySQLAdapter"
+    """
+
+    def __init__(self, kind: str, entry_point_group: str, builtins: dict[str, str]):
+        self.kind = kind
+        self.entry_point_group = entry_point_group
+        self._targets: dict[str, str | type] = dict(builtins)
+        self._entry_points_loaded = False
+
+    def register(self, name: str, target: str | type):
+        """Register an adapter class, or a "module:Class" path to import on first use."""
+        self._targets[name] = target
+
+    def names(self) -> list[str]:
+        self._load_entry_points()
+        return sorted(self._targets)
+
+    def resolve(self, name: str) -> type:
+        if name not in self._targets:
+            self._load_entry_points()
+        if name not in self._targets:
+            raise KeyError(f"Unknown {self.kind} adapter {name!r}, available: {self.names()}")
+
+        target = self._targets[name]
+        if isinstance(target, str):
+            module_name, _, class_name = target.partition(":")
+            target = getattr(import_module(module_name), class_name)
+            self._targets[name] = target
+        return target
+
+    def _load_entry_points(self):
+        # NOTE: Only reads package metadata, the entry points themselves are imported on resolve
+        if self._entry_points_loaded:
+            return
+        for entry_point in entry_points(group=self.entry_point_group):
+            self._targets.setdefault(entry_point.name, entry_point.value)
+        self._entry_points_loaded = True
+
+
+QUEUE_ADAPTERS = AdapterRegistry(
+    kind="queue",
+    entry_point_group="csv_pipeline.queue_adapters",
+    builtins={"in_memory": "adapters.queues:InMemQueueAdapter", "rabbitmq": "adapters.queues:RabbitMQAdapter"},
+)
+BLOB_ADAPTERS = AdapterRegistry(
+    kind="blob",
+    entry_point_group="csv_pipeline.blob_adapters",
+    builtins={"filesystem": "adapters.blobs:FileSystemBlobAdapter", "s3": "adapters.blobs:S3BlobAdapter"},
+)
+DB_ADAPTERS = AdapterRegistry(
+    kind="db",
+    entry_point_group="csv_pipeline.db_adapters",
+    builtins={"sqlite": "adapters.databases:SQLiteAdapter", "postgres": "adapters.databases:PostgreSQLAdapter"},
+)
+
+
+if __name__ == "__main__":
+    pass
@@ -1,10 +1,12 @@
 # External Imports
 import os
+import socket
 
 
 class Config:
     # Default to filesystem
     STORAGE_TYPE = os.getenv("STORAGE_TYPE", "filesystem")
+    # Where the filesystem adapter saves, it reads from LOCAL_STORAGE_PATH so distributed mode needs both the same
     STORAGE_BASE_PATH = os.getenv("STORAGE_BASE_PATH", "./")
 
     # Default to in-memory queue
@@ -17,6 +19,38 @@ class Config:
     # Change this for PostgreSQL
     DB_URI = os.getenv("DB_URI", "sqlite:///sales_data.db")
 
+    # "local" runs the single host queue pipeline, "distributed" shares chunk
+    # work items with every other main.py pointed at the same DB_URI
+    COORDINATION_MODE = os.getenv("COORDINATION_MODE", "local")
+    # NOTE: The process id is appended per worker, so this only needs to be unique per host
+    WORKER_ID = os.getenv("WORKER_ID", socket.gethostname())
+    WORKERS_PER_NODE = int(os.getenv("WORKERS_PER_NODE", os.cpu_count() or 1))
+    CHUNK_BYTES = int(os.getenv("CHUNK_BYTES", 64 * 1024 * 1024))  # Size of each extraction byte range
+    LEASE_TIMEOUT_SECONDS = float(os.getenv("LEASE_TIMEOUT_SECONDS", 60))
+    HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("HEARTBEAT_INTERVAL_SECONDS", 20))
+    COORDINATION_POLL_SECONDS = float(os.getenv("COORDINATION_POLL_SECONDS", 5))
+    MAX_CHUNK_ATTEMPTS = int(os.getenv("MAX_CHUNK_ATTEMPTS", 3))  # Per stage, before a chunk is marked failed
+
+    # Parallel loading, rows are hash partitioned on CustomerID across LOADER_WORKERS connections.
+    # Set LOADER_SHARD_URI_TEMPLATE (e.g. "sqlite:///sales_data_shard_{shard}.db") to give each its own database
+    LOADER_WORKERS = int(os.getenv("LOADER_WORKERS", 1))
+    LOADER_SHARD_URI_TEMPLATE = os.getenv("LOADER_SHARD_URI_TEMPLATE", "")
+
+    # Memory governor, 0 neither caps nor throttles the chunks in flight and only reports the peak RSS at the end
+    MEMORY_BUDGET_MB = int(os.getenv("MEMORY_BUDGET_MB", 0))
+    # Chunks extracted but not yet loaded, only capped when there is a memory budget
+    MAX_IN_FLIGHT_CHUNKS = int(os.getenv("MAX_IN_FLIGHT_CHUNKS", 8))
+    MEMORY_SAMPLE_SECONDS = float(os.getenv("MEMORY_SAMPLE_SECONDS", 1))
+
+    # Rows fetched per round trip by streamed rollup queries
+    QUERY_BATCH_SIZE = int(os.getenv("QUERY_BATCH_SIZE", 1000))
+
+    # Orders partitions that ended more than this many months ago are dropped at startup, 0 keeps everything
+    ORDERS_RETENTION_MONTHS = int(os.getenv("ORDERS_RETENTION_MONTHS", 0))
+
+    # CustomerID / ProductID to surrogate key mappings each loader keeps in memory, per dimension
+    DIMENSION_CACHE_SIZE = int(os.getenv("DIMENSION_CACHE_SIZE", 100_000))
+
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,251 @@
+# External Imports
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+from loguru import logger
+from sqlalchemy import text
+
+# Internal Imports
+from adapters import DBAdapter
+
+# Every chunk walks through these stages in order, whichever node picks it up
+STAGES = ("extract", "transform", "load")
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class ChunkLease:
+    source_key: str
+    chunk_index: int
+    stage: str
+    byte_start: int
+    byte_end: int
+    payload: str | None  # Blob key produced by the previous stage
+    token: str
+    attempts: int
+
+
+class ChunkCoordinator:
+    """
+    Shares chunk work items between any number of pipeline processes through the ChunkLeases table.
+
+    A worker leases one chunk at a time for its current stage, keeps the lease alive with heartbeats and
+    advances the chunk to the next stage on completion. Leases that are not renewed within the timeout are
+    handed to the next worker asking for work, so a crashed node only delays its chunks.
+
+    NOTE: Delivery is at-least-once, a stage whose lease expired mid-flight can run twice.
+    """
+
+    def __init__(self, db_adapter: DBAdapter, lease_timeout: float, max_attempts: int):
+        self.db_adapter = db_adapter
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+
+    def create_table(self):
+        with self.db_adapter.engine.begin() as connection:
+            connection.execute(
+                text(
+                    """
+                    CREATE TABLE IF NOT EXISTS ChunkLeases (
+                        SourceKey TEXT NOT NULL,
+                        ChunkIndex INTEGER NOT NULL,
+                        ByteStart BIGINT NOT NULL,
+                        ByteEnd BIGINT NOT NULL,
+                        Stage TEXT NOT NULL,
+                        Payload TEXT,
+                        LeaseOwner TEXT,
+                        LeaseToken TEXT,
+                        LeaseExpiresAt DOUBLE PRECISION,
+                        Attempts INTEGER NOT NULL DEFAULT 0,
+                        LastError TEXT,
+                        PRIMARY KEY (SourceKey, ChunkIndex)
+                    )
+                    """
+                )
+            )
+            connection.execute(
+                text("CREATE INDEX IF NOT EXISTS idx_chunk_leases_stage ON ChunkLeases (Stage, LeaseExpiresAt);"))
+
+    def seed(self, source_key: str, byte_ranges: list[tuple[int, int]]) -> int:
+        """Register the extraction byte ranges of a source, safe to call concurrently from every node."""
+        if not byte_ranges:
+            return 0
+        with self.db_adapter.engine.begin() as connection:
+            result = connection.execute(
+                text(
+                    f"""
+                    INSERT INTO ChunkLeases (SourceKey, ChunkIndex, ByteStart, ByteEnd, Stage, Attempts)
+                    VALUES (:SourceKey, :ChunkIndex, :ByteStart, :ByteEnd, '{STAGES[0]}', 0)
+                    ON CONFLICT (SourceKey, ChunkIndex) DO NOTHING
+                    """
+                ),
+                [
+                    {"SourceKey": source_key, "ChunkIndex": chunk_index, "ByteStart": start, "ByteEnd": end}
+                    for chunk_index, (start, end) in enumerate(byte_ranges)
+                ],
+            )
+        return max(result.rowcount, 0)
+
+    def acquire(self, owner: str) -> ChunkLease | None:
+        """Lease the next pending (or expired) chunk, preferring chunks furthest down the pipeline."""
+        now = self.db_adapter.EPOCH_NOW_SQL
+        token = uuid.uuid4().hex
+        with self.db_adapter.engine.begin() as connection:
+            # Chunks whose lease expired on their last allowed attempt are given up on
+            connection.execute(
+                text(
+                    f"""
+                    UPDATE ChunkLeases
+                    SET Stage = '{FAILED}', LeaseOwner = NULL, LeaseToken = NULL, LeaseExpiresAt = NULL,
+                        LastError = COALESCE(LastError, 'Lease expired')
+                    WHERE Stage NOT IN ('{DONE}', '{FAILED}')
+                      AND LeaseToken IS NOT NULL AND LeaseExpiresAt < {now}
+                      AND Attempts >= :max_attempts
+                    """
+                ),
+                {"max_attempts": self.max_attempts},
+            )
+            result = connection.execute(
+                text(
+                    f"""
+                    UPDATE ChunkLeases
+                    SET LeaseOwner = :owner, LeaseToken = :token, LeaseExpiresAt = {now} + :lease_timeout,
+                        Attempts = Attempts + 1
+                    WHERE (SourceKey, ChunkIndex) = (
+                        SELECT SourceKey, ChunkIndex FROM ChunkLeases
+                        WHERE Stage NOT IN ('{DONE}', '{FAILED}')
+                          AND (LeaseToken IS NULL OR LeaseExpiresAt < {now})
+                        ORDER BY CASE Stage WHEN 'load' THEN 0 WHEN 'transform' THEN 1 ELSE 2 END, ChunkIndex
+                        LIMIT 1 {self.db_adapter.ROW_LOCK_SQL}
+                    )
+                    AND (LeaseToken IS NULL OR LeaseExpiresAt < {now})
+                    """
+                ),
+                {"owner": owner, "token": token, "lease_timeout": self.lease_timeout},
+            )
+            if result.rowcount != 1:
+                return None
+
+            # NOTE: Unpacked by position, Postgres reports the unquoted column names in lower case
+            source_key, chunk_index, stage, byte_start, byte_end, payload, attempts = connection.execute(
+                text(
+                    """
+                    SELECT SourceKey, ChunkIndex, Stage, ByteStart, ByteEnd, Payload, Attempts
+                    FROM ChunkLeases WHERE LeaseToken = :token
+                    """
+                ),
+                {"token": token},
+            ).one()
+
+        logger.debug(f"{owner} leased chunk {chunk_index} of {source_key} for {stage}")
+        return ChunkLease(
+            source_key=source_key,
+            chunk_index=chunk_index,
+            stage=stage,
+            byte_start=byte_start,
+            byte_end=byte_end,
+            payload=payload,
+            token=token,
+            attempts=attempts,
+        )
+
+    def heartbeat(self, lease: ChunkLease) -> bool:
+        """Extend the lease, returns False once another worker has taken the chunk over."""
+        with self.db_adapter.engine.begin() as connection:
+            result = connection.execute(
+                text(
+                    f"""
+                    UPDATE ChunkLeases SET LeaseExpiresAt = {self.db_adapter.EPOCH_NOW_SQL} + :lease_timeout
+                    WHERE SourceKey = :source_key AND ChunkIndex = :chunk_index AND LeaseToken = :token
+                    """
+                ),
+                self._lease_params(lease) | {"lease_timeout": self.lease_timeout},
+            )
+        return result.rowcount == 1
+
+    def complete(self, lease: ChunkLease, payload: str | None) -> bool:
+        """Advance the chunk to its next stage, returns False if the lease was lost before completion."""
+        next_stage = STAGES[STAGES.index(lease.stage) + 1] if lease.stage != STAGES[-1] else DONE
+        with self.db_adapter.engine.begin() as connection:
+            result = connection.execute(
+                text(
+                    """
+                    UPDATE ChunkLeases
+                    SET Stage = :next_stage, Payload = :payload, LeaseOwner = NULL, LeaseToken = NULL,
+                        LeaseExpiresAt = NULL, Attempts = 0, LastError = NULL
+                    WHERE SourceKey = :source_key AND ChunkIndex = :chunk_index AND LeaseToken = :token
+                    """
+                ),
+                self._lease_params(lease) | {"next_stage": next_stage, "payload": payload},
+            )
+        return result.rowcount == 1
+
+    def release(self, lease: ChunkLease, error: str):
+        """Hand a failed chunk back for a retry, or mark it failed once it is out of attempts."""
+        with self.db_adapter.engine.begin() as connection:
+            connection.execute(
+                text(
+                    f"""
+                    UPDATE ChunkLeases
+                    SET Stage = CASE WHEN Attempts >= :max_attempts THEN '{FAILED}' ELSE Stage END,
+                        LeaseOwner = NULL, LeaseToken = NULL, LeaseExpiresAt = NULL, LastError = :error
+                    WHERE SourceKey = :source_key AND ChunkIndex = :chunk_index AND LeaseToken = :token
+                    """
+                ),
+                self._lease_params(lease) | {"max_attempts": self.max_attempts, "error": error},
+            )
+
+    def is_finished(self, source_key: str) -> bool:
+        with self.db_adapter.engine.connect() as connection:
+            remaining = connection.execute(
+                text(f"SELECT COUNT(*) FROM ChunkLeases WHERE SourceKey = :source_key AND Stage NOT IN ('{DONE}', '{FAILED}')"),
+                {"source_key": source_key},
+            ).scalar_one()
+        return remaining == 0
+
+    @contextmanager
+    def keep_alive(self, lease: ChunkLease, interval: float) -> Iterator["LeaseHeartbeat"]:
+        """Heartbeat the lease from a background thread for as long as the block runs."""
+        heartbeat = LeaseHeartbeat(coordinator=self, lease=lease, interval=interval)
+        heartbeat.start()
+        try:
+            yield heartbeat
+        finally:
+            heartbeat.stop()
+
+    @staticmethod
+    def _lease_params(lease: ChunkLease) -> dict:
+        return {"source_key": lease.source_key, "chunk_index": lease.chunk_index, "token": lease.token}
+
+
+class LeaseHeartbeat(threading.Thread):
+    def __init__(self, coordinator: ChunkCoordinator, lease: ChunkLease, interval: float):
+        super().__init__(name=f"heartbeat-{lease.chunk_index}", daemon=True)
+        self.coordinator = coordinator
+        self.lease = lease
+        self.interval = interval
+        self.lost = False
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                if not self.coordinator.heartbeat(self.lease):
+                    self.lost = True
+                    logger.warning(f"Lost lease on chunk {self.lease.chunk_index} ({self.lease.stage})")
+                    return
+            except Exception as e:
+                # A missed beat is fine as long as the next one lands before the lease times out
+                logger.error(f"Heartbeat failed for chunk {self.lease.chunk_index}: {e}")
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+if __name__ == "__main__":
+    pass
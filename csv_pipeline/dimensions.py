@@ -0,0 +1,64 @@
+# External Imports
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Internal Imports
+from adapters import DBAdapter
+
+
+class DimensionCache:
+    """
+    Bounded in-process map from the natural IDs of one dimension (CustomerID, ProductID) to their surrogate keys.
+
+    Warmed from the dimension table on first use. A chunk is resolved through a categorical, so the cache is
+    consulted once per distinct ID rather than once per row, and only IDs it hasn't seen are sent to the DB,
+    in one bulk insert. The least recently used IDs are evicted beyond `max_size`.
+    """
+
+    def __init__(self, db_adapter: DBAdapter, dimension: str, max_size: int):
+        self.db_adapter = db_adapter
+        self.dimension = dimension
+        self.max_size = max_size
+        self.surrogate_keys: OrderedDict[str, int] = OrderedDict()
+        self.warmed = False
+
+    def warm(self):
+        # NOTE: Fetched newest first, so the newest IDs end up at the most recently used end
+        for natural_id, surrogate_key in reversed(self.db_adapter.fetch_dimension_keys(self.dimension, self.max_size)):
+            self.surrogate_keys[natural_id] = surrogate_key
+        self.warmed = True
+        logger.debug(f"Warmed {self.dimension} cache with {len(self.surrogate_keys)} keys")
+
+    def resolve(self, natural_ids: pd.Series) -> pd.Series:
+        """Surrogate key of every natural ID, missing IDs resolve to <NA>."""
+        if not self.warmed:
+            self.warm()
+
+        categorical = pd.Categorical(natural_ids)
+        categories = categorical.categories.tolist()
+        unseen = [natural_id for natural_id in categories if natural_id not in self.surrogate_keys]
+        if unseen:
+            self.surrogate_keys.update(self.db_adapter.ensure_dimension_keys(self.dimension, unseen))
+
+        category_keys = np.empty(len(categories), dtype=np.int64)
+        for position, natural_id in enumerate(categories):
+            self.surrogate_keys.move_to_end(natural_id)
+            category_keys[position] = self.surrogate_keys[natural_id]
+        self.evict()
+
+        # One take over the category codes maps every row, code -1 is a missing ID
+        codes = categorical.codes
+        surrogate_keys = pd.Series(pd.NA, index=natural_ids.index, dtype="Int64")
+        surrogate_keys[codes >= 0] = category_keys[codes[codes >= 0]]
+        return surrogate_keys
+
+    def evict(self):
+        while len(self.surrogate_keys) > self.max_size:
+            self.surrogate_keys.popitem(last=False)
+
+
+if __name__ == "__main__":
+    pass
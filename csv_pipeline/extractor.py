@@ -1,17 +1,19 @@
 # External Imports
 import os
 import pickle
-from io import StringIO
 from typing import Iterator
+from urllib.parse import quote
 
-import boto3
-import pandas as pd
 from loguru import logger
 
+# Internal Imports
+from adapters import BlobAdapter
+
 # Configuration
 checkpoint_file = "checkpoint.pkl"
 chunk_size = int(os.getenv("CHUNKSIZE", 10000))  # Number of rows per chunk
 output_dir = "output_chunks"  # Directory to save the CSV chunks
+line_scan_bytes = 64 * 1024  # Window read while looking for the next line break
 
 
 def get_checkpoint():
@@ -30,13 +32,18 @@ def save_checkpoint(chunk_number):
 
 def read_and_save_csv_in_chunks(bucket_name: str, s3_key: str) -> Iterator[str]:
     """Read the CSV file from S3 in chunks and save each chunk to the filesystem."""
+    # NOTE: Imported here, the byte range extraction used by distributed workers needs neither
+    import boto3
+    import pandas as pd
+
     # Initialize S3 client
     s3 = boto3.client("s3")
     response = s3.get_object(Bucket=bucket_name, Key=s3_key)
     chunk_number = get_checkpoint()
 
+    # NOTE: Parse straight off the response stream, the body is never held in memory as a whole
     for chunk in pd.read_csv(
-        StringIO(response["Body"].read().decode("utf-8")),
+        response["Body"],
         chunksize=chunk_size,
         skiprows=range(1, chunk_number * chunk_size + 1),
         on_bad_lines="warn",
@@ -55,6 +62,54 @@ def read_and_save_csv_in_chunks(bucket_name: str, s3_key: str) -> Iterator[str]:
         yield str(output_file)
 
 
+def _find_line_end(storage_adapter: BlobAdapter, file_name_with_path: str, offset: int, file_size: int) -> int:
+    """Return the offset just past the first line break at or after `offset`, or the file size."""
+    while offset < file_size:
+        window = storage_adapter.read_range(file_name_with_path, offset, min(offset + line_scan_bytes, file_size))
+        newline_at = window.find(b"\n")
+        if newline_at != -1:
+            return offset + newline_at + 1
+        offset += len(window)
+    return file_size
+
+
+def plan_byte_ranges(storage_adapter: BlobAdapter, file_name_with_path: str, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Split the CSV body (everything after the header) into [start, end) byte ranges of about `chunk_bytes`."""
+    file_size = storage_adapter.get_size(file_name_with_path)
+    header_end = _find_line_end(storage_adapter, file_name_with_path, 0, file_size)
+    return [(start, min(start + chunk_bytes, file_size)) for start in range(header_end, file_size, chunk_bytes)]
+
+
+def chunk_file_name(source_key: str, chunk_index: int) -> str:
+    """Blob key of an extracted chunk, the quoted source key keeps chunks of different sources apart."""
+    return f"{quote(source_key, safe='')}_chunk_{chunk_index}.csv"
+
+
+def extract_byte_range(
+    storage_adapter: BlobAdapter, file_name_with_path: str, chunk_index: int, byte_start: int, byte_end: int
+) -> str:
+    """
+    Save every line that starts inside [byte_start, byte_end) as a standalone CSV chunk with the header.
+
+    Ranges from `plan_byte_ranges` never split a row between two chunks, so every node can extract its
+    ranges independently without reading the rest of the file.
+    NOTE: Assumes no quoted field contains a line break.
+    """
+    file_size = storage_adapter.get_size(file_name_with_path)
+    header_end = _find_line_end(storage_adapter, file_name_with_path, 0, file_size)
+    header = storage_adapter.read_range(file_name_with_path, 0, header_end)
+
+    # A line belongs to the range its first byte falls in
+    body_start = _find_line_end(storage_adapter, file_name_with_path, byte_start - 1, file_size)
+    body_end = _find_line_end(storage_adapter, file_name_with_path, byte_end - 1, file_size)
+    body = storage_adapter.read_range(file_name_with_path, body_start, body_end) if body_start < body_end else b""
+
+    output_file = chunk_file_name(file_name_with_path, chunk_index)
+    storage_adapter.save_data(output_file, header + body)
+    logger.success(f"Saved chunk {chunk_index} of {file_name_with_path} (bytes {body_start}-{body_end})")
+    return output_file
+
+
 def main():
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
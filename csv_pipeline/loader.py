@@ -1,76 +1,183 @@
 # External Imports
+import threading
 from datetime import datetime
 from io import StringIO
 
 import pandas as pd
+from dimensions import DimensionCache
 
 # Internal Imports
-from adapters import BlobAdapter, DBAdapter
+from adapters import DIMENSIONS, ROLLUP_TABLES, BlobAdapter, DBAdapter
+
+ORDER_COLUMNS = ["OrderID", "OrderDate", "CustomerKey", "ProductKey", "Quantity", "UnitPrice", "TotalAmount"]
+# What became of each order row, every row ends up either in Orders or in the error log
+LOADED = "loaded"
+LOGGED = "logged"
+# strftime format of the rollup Period per grain
+ROLLUP_PERIOD_FORMATS = {"day": "%Y-%m-%d", "month": "%Y-%m-01"}
 
 
 class DataLoader:
-    def __init__(self, storage_adapter: BlobAdapter, db_adapter: DBAdapter):
+    def __init__(
+        self,
+        storage_adapter: BlobAdapter,
+        db_adapter: DBAdapter,
+        error_log_prefix: str = "error_log",
+        dimension_cache_size: int = 100_000,
+    ):
         self.storage_adapter = storage_adapter
         self.db_adapter = db_adapter
+        self.error_log_prefix = error_log_prefix
+        self.dimension_caches = {
+            dimension: DimensionCache(db_adapter=db_adapter, dimension=dimension, max_size=dimension_cache_size)
+            for dimension in DIMENSIONS
+        }
         self.error_rows = []
+        # NOTE: The memory governor may flush from its own thread while rows are being processed
+        self.error_lock = threading.Lock()
 
     def log_error(self, row, error_message):
         # Append the error message to the row dictionary
         row["Error"] = error_message
-        self.error_rows.append(row)
+        with self.error_lock:
+            self.error_rows.append(row)
 
     def save_error_log(self, error_file_name):
-        if self.error_rows:
+        # Take the buffered rows so they are written once and don't pile up across files
+        with self.error_lock:
+            error_rows, self.error_rows = self.error_rows, []
+        if error_rows:
             # Create a DataFrame from the error rows
-            error_df = pd.DataFrame(self.error_rows)
+            error_df = pd.DataFrame(error_rows)
             # Save to a CSV using storage adapter
-            csv_data = error_df.to_csv(index=False)
+            csv_data = error_df.to_csv(index=False).encode("utf-8")
             self.storage_adapter.save_data(error_file_name, csv_data)
 
-    def process_file(self, file_name_with_path: str):
+    def flush_errors(self):
+        self.save_error_log(f"{self.error_log_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.csv")
+
+    def process_file(self, file_name_with_path: str, source_chunk: str | None = None, delete: bool = True):
+        """
+        Load a transformed file. Passing `source_chunk` makes its SalesSummary rows idempotent, loading the
+        same chunk again overwrites them instead of adding to them. Leased loads delete the file themselves,
+        once the lease completes.
+        """
         raw_data = self.storage_adapter.read_data(
             file_name_with_path=file_name_with_path)
         data = pd.read_csv(StringIO(raw_data), dtype=str, on_bad_lines="warn")
 
-        # Process orders and handle errors
-        data.apply(self.process_order, axis=1)
+        self.process_dataframe(data, source_chunk=source_chunk)
+
+        # Delete original data file after processing
+        if delete:
+            self.storage_adapter.delete_data(
+                file_name_with_path=file_name_with_path)
+
+    def process_dataframe(self, data: pd.DataFrame, source_chunk: str | None = None) -> pd.Series:
+        """Load one chunk of rows, returns the LOADED / LOGGED outcome of every row."""
+        if data.empty:
+            return pd.Series(dtype=object)
+
+        # Swap CustomerID and ProductID for their surrogate keys, everything below stores and groups on those
+        data = self.resolve_dimension_keys(data)
+
+        # Process orders along with their daily and monthly rollups and handle errors
+        order_outcomes = self.process_orders(data)
 
         # Aggregate sales summary
-        summary_df = data.groupby(["CustomerID", "ProductID"]).agg(
-            {"TotalAmount": "sum"}).reset_index()
+        summary_df = (
+            data.assign(TotalAmount=pd.to_numeric(data["TotalAmount"], errors="coerce"))
+            .groupby(["CustomerKey", "ProductKey"])
+            .agg({"TotalAmount": "sum"})
+            .reset_index()
+        )
 
         # Process sales summary and handle errors
-        summary_df.apply(self.process_sales_summary, axis=1)
+        # NOTE: object dtype hands plain python numbers to the DB driver
+        summary_df.astype(object).apply(self.process_sales_summary, axis=1, source_chunk=source_chunk)
 
         # Save error log if there are any errors
-        error_file_name = f"error_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        self.save_error_log(error_file_name)
-
-        # Delete original data file after processing
-        self.storage_adapter.delete_data(
-            file_name_with_path=file_name_with_path)
+        self.flush_errors()
+        return order_outcomes
+
+    def resolve_dimension_keys(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data.assign(
+            **{
+                key_column: self.dimension_caches[dimension].resolve(data[id_column])
+                for dimension, (_, key_column, id_column) in DIMENSIONS.items()
+            }
+        )
+
+    def process_orders(self, data: pd.DataFrame) -> pd.Series:
+        """Bulk insert each month of orders into its partition, returns whether each row was loaded or logged."""
+        outcomes = pd.Series(None, index=data.index, dtype=object)
+        order_dates = pd.to_datetime(data["OrderDate"], errors="coerce")
+        for index, row in data[order_dates.isna()].iterrows():
+            self.log_error(row.to_dict(), f"Cannot route OrderDate {row['OrderDate']!r} to a partition")
+            outcomes[index] = LOGGED
+
+        # NOTE: Stored as ISO dates so the partition ranges compare the same way on every DB
+        orders = data[order_dates.notna()].assign(OrderDate=order_dates.dt.strftime("%Y-%m-%d"))
+        for month, month_orders in orders.groupby(order_dates[orders.index].dt.to_period("M")):
+            try:
+                partition = self.db_adapter.ensure_order_partition(month.to_timestamp().date())
+                self.db_adapter.insert_orders(
+                    partition,
+                    month_orders[ORDER_COLUMNS].astype(object).to_dict("records"),
+                    rollups=self.rollup_rows(month_orders),
+                )
+                outcomes[month_orders.index] = LOADED
+            except Exception:
+                # One bad row fails the whole batch, fall back to row by row to log exactly which.
+                # Each row ensures its partition again, so a partition dropped under the cache is re-created first
+                loaded = month_orders.astype(object).apply(self.process_order, axis=1).astype(bool)
+                outcomes[month_orders.index] = loaded.map({True: LOADED, False: LOGGED})
+        return outcomes
 
     def process_order(self, row):
         try:
             order_data = {
                 "OrderID": row["OrderID"],
                 "OrderDate": row["OrderDate"],
-                "CustomerID": row["CustomerID"],
-                "ProductID": row["ProductID"],
+                "CustomerKey": row["CustomerKey"],
+                "ProductKey": row["ProductKey"],
                 "Quantity": row["Quantity"],
                 "UnitPrice": row["UnitPrice"],
                 "TotalAmount": row["TotalAmount"],
             }
-            self.db_adapter.insert_order(order_data)
+            self.db_adapter.insert_order(order_data, rollups=self.rollup_rows(row.to_frame().T))
+            return True
         except Exception as e:
             # Log the error and the row that caused it
             self.log_error(row.to_dict(), str(e))
-
-    def process_sales_summary(self, row):
+            return False
+
+    def rollup_rows(self, orders: pd.DataFrame) -> dict[str, list[dict]]:
+        """Daily and monthly rollup rows of the given orders, keyed by grain."""
+        orders = orders.assign(
+            OrderDate=pd.to_datetime(orders["OrderDate"], errors="coerce"),
+            Quantity=pd.to_numeric(orders["Quantity"], errors="coerce"),
+            TotalAmount=pd.to_numeric(orders["TotalAmount"], errors="coerce"),
+        ).dropna(subset=["OrderDate"])
+
+        rollups = {}
+        for grain in ROLLUP_TABLES:
+            period = orders["OrderDate"].dt.strftime(ROLLUP_PERIOD_FORMATS[grain]).rename("Period")
+            rollup_df = (
+                orders.groupby(["CustomerKey", "ProductKey", period])
+                .agg(TotalSales=("TotalAmount", "sum"), Quantity=("Quantity", "sum"), OrderCount=("OrderID", "count"))
+                .reset_index()
+            )
+            # NOTE: object dtype hands plain python numbers to the DB driver
+            rollups[grain] = rollup_df.astype(object).to_dict("records")
+        return rollups
+
+    def process_sales_summary(self, row, source_chunk=None):
         try:
             summary_data = {
-                "CustomerID": row["CustomerID"],
-                "ProductID": row["ProductID"],
+                "SourceChunk": source_chunk,
+                "CustomerKey": row["CustomerKey"],
+                "ProductKey": row["ProductKey"],
                 "TotalSales": row["TotalAmount"],
             }
             self.db_adapter.insert_sales_summary(summary_data)
@@ -1,55 +1,134 @@
+from __future__ import annotations
+
 # External Imports
+import multiprocessing
 import os
 import signal
+import time
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 from config import Config
-from extractor import read_and_save_csv_in_chunks
-from loader import DataLoader
+from extractor import extract_byte_range, plan_byte_ranges, read_and_save_csv_in_chunks
 from loguru import logger
-from transformer import cleanse_and_validate
+from memory_governor import FlushListener, MemoryGovernor, get_chunk_slots, install_chunk_slots
 
 # Internal Imports
-from adapters import (
-    BlobAdapter,
-    DBAdapter,
-    FileSystemBlobAdapter,
-    InMemQueueAdapter,
-    PostgreSQLAdapter,
-    QueueAdapter,
-    RabbitMQAdapter,
-    S3BlobAdapter,
-    SQLiteAdapter,
-)
-
-QUEUE_ADAPTER_MAP = {"in_memory": InMemQueueAdapter,
-                     "rabbitmq": RabbitMQAdapter}
-BLOB_ADAPTER_MAP = {"filesystem": FileSystemBlobAdapter, "s3": S3BlobAdapter}
-DB_ADAPTER_MAP = {"sqlite": SQLiteAdapter, "postgres": PostgreSQLAdapter}
+from adapters import BLOB_ADAPTERS, DB_ADAPTERS, QUEUE_ADAPTERS
+
+# NOTE: Heavy modules (pandas, sanctify, SQLAlchemy) are imported where they are first needed so the CLI
+# and every pool worker start without them, see scripts/bench_startup.py
+if TYPE_CHECKING:
+    from coordinator import ChunkCoordinator, ChunkLease
+    from loader import DataLoader
+    from partitioned_loader import PartitionedLoader
+
+    from adapters import BlobAdapter, DBAdapter, QueueAdapter
+
+# Modules each kind of pool worker imports on entry, before its first task
+WORKER_MODULES = {
+    "transform": ["transformer"],
+    "coordinated": [
+        "adapters.blobs",
+        "adapters.databases",
+        "transformer",
+        "loader",
+        "partitioned_loader",
+        "coordinator",
+    ],
+}
+
+
+def preload_worker_modules(worker: str):
+    """Import a worker's modules right before its pool starts, when the pool forks them."""
+    # NOTE: Forked workers inherit them instead of each importing them again, spawned workers would not
+    if multiprocessing.get_start_method() == "fork":
+        for module_name in WORKER_MODULES[worker]:
+            import_module(module_name)
 
 
 def get_queue_adapter(config: Config) -> QueueAdapter:
-    return QUEUE_ADAPTER_MAP[config.QUEUE_TYPE](config=config)
+    return QUEUE_ADAPTERS.resolve(config.QUEUE_TYPE)(config=config)
 
 
 def get_blob_adapter(config: Config) -> BlobAdapter:
-    return BLOB_ADAPTER_MAP[config.STORAGE_TYPE](config=config)
+    return BLOB_ADAPTERS.resolve(config.STORAGE_TYPE)(config=config)
+
+
+def get_db_adapter(config: Config, db_uri: str | None = None) -> DBAdapter:
+    return DB_ADAPTERS.resolve(config.DB_TYPE)(config=config, db_uri=db_uri)
+
+
+def purge_expired_orders(config: Config, db_adapters: list[DBAdapter]):
+    """Apply the Orders retention policy by dropping whole monthly partitions."""
+    if config.ORDERS_RETENTION_MONTHS <= 0:
+        return
+    months = date.today().year * 12 + date.today().month - 1 - config.ORDERS_RETENTION_MONTHS
+    cutoff = date(months // 12, months % 12 + 1, 1)
+    for db_adapter in db_adapters:
+        dropped = db_adapter.drop_order_partitions_before(cutoff)
+        logger.info(f"Dropped {len(dropped)} Orders partitions before {cutoff}: {dropped}")
+
+
+def get_loader(config: Config, storage_adapter: BlobAdapter, db_adapter: DBAdapter) -> DataLoader | PartitionedLoader:
+    from loader import DataLoader
+    from partitioned_loader import PartitionedLoader
+
+    if config.LOADER_WORKERS <= 1:
+        return DataLoader(
+            storage_adapter=storage_adapter, db_adapter=db_adapter, dimension_cache_size=config.DIMENSION_CACHE_SIZE
+        )
 
+    if not config.LOADER_SHARD_URI_TEMPLATE:
+        # Same database, one connection per partition worker
+        shard_db_adapters = [get_db_adapter(config=config) for _ in range(config.LOADER_WORKERS)]
+        return PartitionedLoader(
+            storage_adapter=storage_adapter,
+            db_adapters=shard_db_adapters,
+            dimension_cache_size=config.DIMENSION_CACHE_SIZE,
+        )
+
+    shard_db_adapters = [
+        get_db_adapter(config=config, db_uri=config.LOADER_SHARD_URI_TEMPLATE.format(shard=shard))
+        for shard in range(config.LOADER_WORKERS)
+    ]
+    loader = PartitionedLoader(
+        storage_adapter=storage_adapter, db_adapters=shard_db_adapters, dimension_cache_size=config.DIMENSION_CACHE_SIZE
+    )
+    loader.create_tables()
+    purge_expired_orders(config=config, db_adapters=shard_db_adapters)
+    return loader
 
-def get_db_adapter(config: Config) -> DBAdapter:
-    return DB_ADAPTER_MAP[config.DB_TYPE](config=config)
+
+def get_memory_governor(config: Config) -> MemoryGovernor:
+    return MemoryGovernor(
+        budget_bytes=config.MEMORY_BUDGET_MB * 1024 * 1024,
+        max_in_flight=config.MAX_IN_FLIGHT_CHUNKS,
+        interval=config.MEMORY_SAMPLE_SECONDS,
+    )
 
 
 def handle_extraction(queue_adapter: QueueAdapter, config: Config):
     logger.debug("Starting Async Extractor")
-    for extracted_chunk_path in read_and_save_csv_in_chunks(
-        bucket_name=config.S3_BUCKET, s3_key=config.LARGE_FILE_S3_KEY
-    ):
+    chunk_slots = get_chunk_slots()
+    extracted_chunk_paths = read_and_save_csv_in_chunks(bucket_name=config.S3_BUCKET, s3_key=config.LARGE_FILE_S3_KEY)
+    while True:
+        # NOTE: Waiting for a slot before pulling the next chunk is what throttles extraction
+        chunk_slots.acquire()
+        extracted_chunk_path = next(extracted_chunk_paths, None)
+        if extracted_chunk_path is None:
+            chunk_slots.release()
+            return
+
         logger.debug("Publishing extracted_chunk_path to transform_queue")
         queue_adapter.publish(extracted_chunk_path, "transform_queue")
 
 
 def handle_transformation(queue_adapter: QueueAdapter):
+    from transformer import cleanse_and_validate
+
     logger.debug("Starting Transformation Consumer")
     while True:
         logger.debug("Waiting to consume from transform_queue")
@@ -67,9 +146,12 @@ def handle_transformation(queue_adapter: QueueAdapter):
         if transformed_file_path:
             logger.debug(f"Publishing {transformed_file_path} to loader_queue")
             queue_adapter.publish(transformed_file_path, "loader_queue")
+        else:
+            # The chunk never reaches the loader, hand its slot back here
+            get_chunk_slots().release()
 
 
-def handle_loading(queue_adapter: QueueAdapter, loader: DataLoader):
+def handle_loading(queue_adapter: QueueAdapter, loader: DataLoader | PartitionedLoader):
     logger.debug("Starting Loader Consumer")
     while True:
         try:
@@ -82,30 +164,169 @@ def handle_loading(queue_adapter: QueueAdapter, loader: DataLoader):
             logger.debug(
                 f"Received file path: {transformed_file_path} from loader_queue")
             logger.debug("Loading transformed_file_path")
-            loader.process_file(file_name_with_path=transformed_file_path)
+            try:
+                loader.process_file(file_name_with_path=transformed_file_path)
+            finally:
+                get_chunk_slots().release()
             logger.success("Processed File")
         except Exception as e:
             logger.error(f"Error in handle_loading: {e}")
 
 
+def get_chunk_coordinator(config: Config, db_adapter: DBAdapter) -> ChunkCoordinator:
+    from coordinator import ChunkCoordinator
+
+    return ChunkCoordinator(
+        db_adapter=db_adapter, lease_timeout=config.LEASE_TIMEOUT_SECONDS, max_attempts=config.MAX_CHUNK_ATTEMPTS
+    )
+
+
+def run_coordinated_worker(config: Config):
+    """Lease chunks from the shared ChunkLeases table and run whichever stage each one is at until none are left."""
+    worker_id = f"{config.WORKER_ID}-{os.getpid()}"
+    storage_adapter = get_blob_adapter(config=config)
+    db_adapter = get_db_adapter(config=config)
+    loader = get_loader(config=config, storage_adapter=storage_adapter, db_adapter=db_adapter)
+    coordinator = get_chunk_coordinator(config=config, db_adapter=db_adapter)
+
+    def extract(lease: ChunkLease) -> str:
+        return extract_byte_range(
+            storage_adapter=storage_adapter,
+            file_name_with_path=lease.source_key,
+            chunk_index=lease.chunk_index,
+            byte_start=lease.byte_start,
+            byte_end=lease.byte_end,
+        )
+
+    def transform(lease: ChunkLease) -> str:
+        from transformer import cleanse_and_validate_blob
+
+        return cleanse_and_validate_blob(storage_adapter=storage_adapter, input_file_name=lease.payload)
+
+    def load(lease: ChunkLease) -> None:
+        # NOTE: The file is kept until the lease completes, a worker taking over an expired lease still needs it
+        loader.process_file(
+            file_name_with_path=lease.payload, source_chunk=f"{lease.source_key}:{lease.chunk_index}", delete=False
+        )
+
+    stage_handlers = {"extract": extract, "transform": transform, "load": load}
+    chunk_slots = get_chunk_slots()
+    # The governor lives in the parent process, forced flushes reach this worker's loader through the slots
+    flush_listener = FlushListener(chunk_slots=chunk_slots, callback=loader.flush_errors)
+    flush_listener.start()
+
+    logger.debug(f"Starting coordinated worker {worker_id}")
+    while True:
+        # NOTE: Under memory pressure the governor lowers the slot count and idles some of the workers
+        chunk_slots.acquire()
+        lease = coordinator.acquire(owner=worker_id)
+        if lease is None:
+            chunk_slots.release()
+            if coordinator.is_finished(config.LARGE_FILE_S3_KEY):
+                logger.success(f"No chunks left for {worker_id}")
+                flush_listener.stop()
+                return
+            logger.debug("No chunk available, continue waiting...")
+            time.sleep(config.COORDINATION_POLL_SECONDS)
+            continue
+
+        try:
+            with coordinator.keep_alive(lease, interval=config.HEARTBEAT_INTERVAL_SECONDS):
+                payload = stage_handlers[lease.stage](lease)
+        except Exception as e:
+            logger.error(f"Error in {lease.stage} of chunk {lease.chunk_index}: {e}")
+            coordinator.release(lease, error=str(e))
+            continue
+        finally:
+            chunk_slots.release()
+
+        if coordinator.complete(lease, payload=payload):
+            logger.success(f"Finished {lease.stage} of chunk {lease.chunk_index}")
+            # The previous stage's file is no longer needed once this stage is recorded
+            if lease.payload is not None:
+                try:
+                    storage_adapter.delete_data(file_name_with_path=lease.payload)
+                except Exception as e:
+                    logger.error(f"Error deleting {lease.stage} input {lease.payload}: {e}")
+        else:
+            logger.warning(f"Lease on chunk {lease.chunk_index} expired before {lease.stage} finished")
+
+
+def run_distributed(config: Config):
+    """Join the shared chunk pool for LARGE_FILE_S3_KEY, any number of hosts can run this side by side."""
+    # NOTE: The filesystem adapter saves under STORAGE_BASE_PATH and reads under LOCAL_STORAGE_PATH, every stage
+    # reads back the chunk the previous one saved so both have to be the same directory
+    if config.STORAGE_TYPE == "filesystem" and (
+        os.path.realpath(config.STORAGE_BASE_PATH) != os.path.realpath(config.LOCAL_STORAGE_PATH)
+    ):
+        raise ValueError(
+            f"Distributed mode needs STORAGE_BASE_PATH ({config.STORAGE_BASE_PATH}) and LOCAL_STORAGE_PATH "
+            f"({config.LOCAL_STORAGE_PATH}) to be the same directory"
+        )
+    storage_adapter = get_blob_adapter(config=config)
+    db_adapter = get_db_adapter(config=config)
+    coordinator = get_chunk_coordinator(config=config, db_adapter=db_adapter)
+
+    db_adapter.create_tables()
+    purge_expired_orders(config=config, db_adapters=[db_adapter])
+    coordinator.create_table()
+    # NOTE: Every node plans the same ranges, only the first one to get here actually inserts them
+    seeded = coordinator.seed(
+        source_key=config.LARGE_FILE_S3_KEY,
+        byte_ranges=plan_byte_ranges(storage_adapter, config.LARGE_FILE_S3_KEY, config.CHUNK_BYTES),
+    )
+    logger.info(f"Seeded {seeded} new chunks for {config.LARGE_FILE_S3_KEY}")
+    # Workers open their own connections, don't hand pooled ones across the fork
+    db_adapter.engine.dispose()
+
+    memory_governor = get_memory_governor(config=config)
+    memory_governor.start()
+    preload_worker_modules("coordinated")
+    with ProcessPoolExecutor(
+        max_workers=config.WORKERS_PER_NODE, initializer=install_chunk_slots, initargs=(memory_governor.chunk_slots,)
+    ) as process_executor:
+        futures = [process_executor.submit(run_coordinated_worker, config) for _ in range(config.WORKERS_PER_NODE)]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error in coordinated worker: {e}")
+
+    memory_governor.stop()
+    memory_governor.report()
+
+
 def main():
     config = Config()
 
+    if config.COORDINATION_MODE == "distributed":
+        run_distributed(config=config)
+        return
+
     queue_adapter = get_queue_adapter(config=config)
     storage_adapter = get_blob_adapter(config=config)
     db_adapter = get_db_adapter(config=config)
-    loader = DataLoader(storage_adapter=storage_adapter, db_adapter=db_adapter)
 
     db_adapter.create_tables()
+    purge_expired_orders(config=config, db_adapters=[db_adapter])
+    loader = get_loader(config=config, storage_adapter=storage_adapter, db_adapter=db_adapter)
 
     # Create necessary queues
     queue_adapter.create_queue("transform_queue")
     queue_adapter.create_queue("loader_queue")
 
+    memory_governor = get_memory_governor(config=config)
+    memory_governor.register_flush(loader.flush_errors)
+    install_chunk_slots(memory_governor.chunk_slots)
+    memory_governor.start()
+    preload_worker_modules("transform")
+
     # Set up executors
     with (
         ThreadPoolExecutor(max_workers=3) as thread_executor,
-        ProcessPoolExecutor(max_workers=os.cpu_count()) as process_executor,
+        ProcessPoolExecutor(
+            max_workers=os.cpu_count(), initializer=install_chunk_slots, initargs=(memory_governor.chunk_slots,)
+        ) as process_executor,
     ):
 
         # Submit the tasks to the respective executors
@@ -135,6 +356,9 @@ def main():
         except Exception as e:
             logger.error(f"Error: {e}")
 
+    memory_governor.stop()
+    memory_governor.report()
+
 
 if __name__ == "__main__":
     main()
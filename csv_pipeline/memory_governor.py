@@ -0,0 +1,224 @@
+# External Imports
+import multiprocessing
+import os
+import threading
+import time
+from typing import Callable
+
+import psutil
+from loguru import logger
+
+# Installed in every process by `install_chunk_slots`, pool workers get it through the pool initializer
+_chunk_slots: "ChunkSlots | None" = None
+
+
+class ChunkSlots:
+    """
+    Cross-process cap on the number of chunks between extraction and load.
+
+    Backed by multiprocessing primitives so the MemoryGovernor in the main process can resize it while pool
+    workers block on it. It also carries the governor's flush requests to the workers, see FlushListener.
+    A limit of 0 never blocks, the governor hands those out when it has no budget to enforce.
+    NOTE: Can only reach pool workers through inheritance, i.e. the pool `initializer`, not `submit`.
+    """
+
+    def __init__(self, limit: int):
+        self._condition = multiprocessing.Condition()
+        self._limit = multiprocessing.RawValue("i", limit)
+        self._in_flight = multiprocessing.RawValue("i", 0)
+        self._waited_seconds = multiprocessing.RawValue("d", 0.0)
+        self._flush_requests = multiprocessing.RawValue("i", 0)
+
+    @property
+    def limit(self) -> int:
+        return self._limit.value
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight.value
+
+    @property
+    def waited_seconds(self) -> float:
+        return self._waited_seconds.value
+
+    @property
+    def flush_requests(self) -> int:
+        return self._flush_requests.value
+
+    def request_flush(self):
+        with self._condition:
+            self._flush_requests.value += 1
+            self._condition.notify_all()
+
+    def wait_for_flush_request(self, seen: int, timeout: float) -> int:
+        """Block until the flush request count moves past `seen` or the timeout passes, returns the count."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._flush_requests.value != seen, timeout=timeout)
+            return self._flush_requests.value
+
+    def resize(self, limit: int):
+        with self._condition:
+            self._limit.value = max(limit, 1)  # NOTE: One chunk is always allowed, so the pipeline can't stall
+            self._condition.notify_all()
+
+    def acquire(self):
+        started_at = time.monotonic()
+        with self._condition:
+            self._condition.wait_for(lambda: self._limit.value <= 0 or self._in_flight.value < self._limit.value)
+            self._in_flight.value += 1
+            self._waited_seconds.value += time.monotonic() - started_at
+
+    def release(self):
+        with self._condition:
+            self._in_flight.value = max(self._in_flight.value - 1, 0)
+            self._condition.notify_all()
+
+
+def install_chunk_slots(chunk_slots: ChunkSlots):
+    global _chunk_slots
+    _chunk_slots = chunk_slots
+
+
+def get_chunk_slots() -> ChunkSlots:
+    if _chunk_slots is None:
+        raise RuntimeError("Chunk slots were not installed in this process")
+    return _chunk_slots
+
+
+class FlushListener(threading.Thread):
+    """Runs `callback` (e.g. a loader's flush_errors) in this process whenever the governor forces a flush."""
+
+    def __init__(self, chunk_slots: ChunkSlots, callback: Callable[[], None], interval: float = 1.0):
+        super().__init__(name="flush-listener", daemon=True)
+        self.chunk_slots = chunk_slots
+        self.callback = callback
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        seen = self.chunk_slots.flush_requests
+        while not self._stopped.is_set():
+            requested = self.chunk_slots.wait_for_flush_request(seen, timeout=self.interval)
+            if requested == seen:
+                continue
+            seen = requested
+            try:
+                self.callback()
+            except Exception as e:
+                logger.error(f"Error in forced flush: {e}")
+
+    def stop(self):
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
+
+
+class MemoryGovernor(threading.Thread):
+    """
+    Samples the RSS of this process and all of its children and backs off as it nears the budget.
+
+    Above `soft_ratio` of the budget the number of in-flight chunks is halved on every sample, which throttles
+    extraction as it waits for a free slot. At the budget it drops to a single chunk and the registered flush
+    callbacks (error sinks) are forced, pool workers flush their own through a FlushListener. Slots grow back
+    one at a time once usage falls under the soft limit.
+    A budget of 0 leaves the chunk slots unbounded and only tracks the peaks for `report`.
+    """
+
+    def __init__(self, budget_bytes: int, max_in_flight: int, soft_ratio: float = 0.8, interval: float = 1.0):
+        super().__init__(name="memory-governor", daemon=True)
+        self.budget_bytes = budget_bytes
+        self.max_in_flight = max_in_flight
+        self.soft_ratio = soft_ratio
+        self.interval = interval
+        self.chunk_slots = ChunkSlots(limit=max_in_flight if budget_bytes > 0 else 0)
+        self.flush_callbacks: list[Callable[[], None]] = []
+        self.peak_rss_bytes = 0
+        self.peak_process_rss_bytes: dict[int, int] = {}
+        self.min_in_flight = max_in_flight
+        self.forced_flushes = 0
+        self.over_budget = False
+        self._process = psutil.Process(os.getpid())
+        self._stopped = threading.Event()
+
+    def register_flush(self, callback: Callable[[], None]):
+        self.flush_callbacks.append(callback)
+
+    def sample(self) -> int:
+        """Return the RSS of the whole process tree, recording per-process peaks on the way."""
+        total_rss_bytes = 0
+        for process in [self._process, *self._process.children(recursive=True)]:
+            try:
+                rss_bytes = process.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+            total_rss_bytes += rss_bytes
+            self.peak_process_rss_bytes[process.pid] = max(self.peak_process_rss_bytes.get(process.pid, 0), rss_bytes)
+        self.peak_rss_bytes = max(self.peak_rss_bytes, total_rss_bytes)
+        return total_rss_bytes
+
+    def govern(self):
+        rss_bytes = self.sample()
+        if not self.budget_bytes:
+            return
+
+        limit = self.chunk_slots.limit
+        over_budget = rss_bytes >= self.budget_bytes
+        if over_budget and not self.over_budget:
+            logger.warning(f"RSS {rss_bytes >> 20} MiB is over the {self.budget_bytes >> 20} MiB budget")
+        self.over_budget = over_budget
+
+        if over_budget:
+            new_limit = 1
+            self.force_flush()
+        elif rss_bytes >= self.budget_bytes * self.soft_ratio:
+            new_limit = limit // 2
+        else:
+            new_limit = min(limit + 1, self.max_in_flight)
+
+        if new_limit != limit:
+            self.chunk_slots.resize(new_limit)
+            self.min_in_flight = min(self.min_in_flight, self.chunk_slots.limit)
+            logger.debug(f"In-flight chunk limit {limit} -> {self.chunk_slots.limit} at RSS {rss_bytes >> 20} MiB")
+
+    def force_flush(self):
+        self.forced_flushes += 1
+        self.chunk_slots.request_flush()
+        for callback in self.flush_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in forced flush: {e}")
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.govern()
+            except Exception as e:
+                logger.error(f"Error in memory governor: {e}")
+
+    def stop(self):
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
+
+    def report(self) -> dict:
+        """Log and return the peak memory seen over the run."""
+        self.sample()
+        report = {
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "budget_bytes": self.budget_bytes,
+            "peak_process_rss_bytes": dict(self.peak_process_rss_bytes),
+            "min_in_flight": self.min_in_flight,
+            "throttled_seconds": round(self.chunk_slots.waited_seconds, 3),
+            "forced_flushes": self.forced_flushes,
+        }
+        logger.info(
+            f"Peak RSS {self.peak_rss_bytes / 2**20:.1f} MiB across {len(self.peak_process_rss_bytes)} processes "
+            f"(budget {self.budget_bytes / 2**20:.1f} MiB), in-flight chunks went down to {self.min_in_flight}, "
+            f"throttled for {report['throttled_seconds']}s, {self.forced_flushes} forced flushes"
+        )
+        return report
+
+
+if __name__ == "__main__":
+    pass
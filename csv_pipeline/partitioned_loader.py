@@ -0,0 +1,91 @@
+# External Imports
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import pandas as pd
+from loader import LOADED, LOGGED, DataLoader
+from loguru import logger
+
+# Internal Imports
+from adapters import BlobAdapter, DBAdapter
+
+PARTITION_KEY = "CustomerID"
+
+
+def partition_rows(data: pd.DataFrame, partition_count: int) -> list[pd.DataFrame]:
+    """Split rows on a stable hash of the CustomerID so a customer always lands on the same partition."""
+    # NOTE: hash_pandas_object is seeded identically in every process, unlike the builtin hash()
+    partition_ids = pd.util.hash_pandas_object(data[PARTITION_KEY], index=False).to_numpy() % partition_count
+    return [data[partition_ids == partition] for partition in range(partition_count)]
+
+
+def check_partition_coverage(data: pd.DataFrame, outcomes: list[pd.Series]):
+    """Raise unless the partition loads accounted for every input row exactly once, as loaded or as logged."""
+    outcome = pd.concat(outcomes) if outcomes else pd.Series(dtype=object)
+    if len(outcome) != len(data) or not outcome.index.sort_values().equals(data.index.sort_values()):
+        raise ValueError(f"Partition loads reported {len(outcome)} rows for {len(data)} input rows")
+
+    unaccounted = outcome[~outcome.isin([LOADED, LOGGED])]
+    if not unaccounted.empty:
+        raise ValueError(f"{len(unaccounted)} rows were neither loaded nor logged: {list(unaccounted.index[:10])}")
+
+
+class PartitionedLoader:
+    """
+    Loads each file through one DataLoader per partition in parallel.
+
+    Every partition worker owns its DBAdapter (and so its connection pool), and rows are routed by CustomerID
+    so no two workers ever write the same SalesSummary keys. Pointing the adapters at separate databases
+    gives a sharded layout, pointing them at one database just adds parallel writers.
+    Each DataLoader keeps its own dimension caches, which routing by CustomerID keeps disjoint for customers.
+    """
+
+    def __init__(self, storage_adapter: BlobAdapter, db_adapters: list[DBAdapter], dimension_cache_size: int = 100_000):
+        self.storage_adapter = storage_adapter
+        self.loaders = [
+            DataLoader(
+                storage_adapter=storage_adapter,
+                db_adapter=db_adapter,
+                error_log_prefix=f"error_log_p{partition}",
+                dimension_cache_size=dimension_cache_size,
+            )
+            for partition, db_adapter in enumerate(db_adapters)
+        ]
+        self.executor = ThreadPoolExecutor(max_workers=len(self.loaders), thread_name_prefix="loader")
+
+    def create_tables(self):
+        for loader in self.loaders:
+            loader.db_adapter.create_tables()
+
+    def process_file(self, file_name_with_path: str, source_chunk: str | None = None, delete: bool = True):
+        raw_data = self.storage_adapter.read_data(
+            file_name_with_path=file_name_with_path)
+        data = pd.read_csv(StringIO(raw_data), dtype=str, on_bad_lines="warn")
+
+        partitions = partition_rows(data, len(self.loaders))
+        futures = [
+            self.executor.submit(loader.process_dataframe, partition, source_chunk=source_chunk)
+            for loader, partition in zip(self.loaders, partitions)
+            if not partition.empty
+        ]
+        # NOTE: Surfaces the first partition failure, the file is kept so it can be loaded again
+        outcomes = [future.result() for future in futures]
+        # Final consistency check, the file is also kept if any row went missing between the partitions
+        check_partition_coverage(data, outcomes)
+        logger.debug(f"Loaded {len(data)} rows across {len(futures)} partitions")
+
+        # Delete original data file after processing
+        if delete:
+            self.storage_adapter.delete_data(
+                file_name_with_path=file_name_with_path)
+
+    def flush_errors(self):
+        for loader in self.loaders:
+            loader.flush_errors()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,98 @@
+# External Imports
+from typing import Iterator
+
+from sqlalchemy import Row
+
+# Internal Imports
+from adapters import DIMENSIONS, ROLLUP_TABLES, DBAdapter
+
+GROUP_BY_COLUMNS = ("CustomerID", "ProductID", "Period")
+# Natural ID column: (dimension table, surrogate key column the rollups hold instead)
+DIMENSION_COLUMNS = {id_column: (table, key_column) for table, key_column, id_column in DIMENSIONS.values()}
+
+
+def dimension_filter(id_column: str, param: str) -> str:
+    """Condition on the surrogate key of a natural ID, looked up once through the dimension's unique index."""
+    table, key_column = DIMENSION_COLUMNS[id_column]
+    return f"{key_column} = (SELECT {key_column} FROM {table} WHERE {id_column} = :{param})"
+
+
+class SalesQueries:
+    """
+    Dashboard aggregates served from the rollup tables instead of GROUP BYs over Orders.
+
+    The rollups hold one row per customer, product and day (or month), so reads stay flat as Orders grows
+    and never compete with the loader for the fact table. Totals are grouped on the integer surrogate keys,
+    the dimensions are only joined in to label the grouped rows. Results are streamed `batch_size` rows at a time.
+    """
+
+    def __init__(self, db_adapter: DBAdapter, batch_size: int = 1000):
+        self.db_adapter = db_adapter
+        self.batch_size = batch_size
+
+    def sales_totals(
+        self,
+        group_by: tuple[str, ...] = GROUP_BY_COLUMNS,
+        grain: str = "month",
+        customer_id: str | None = None,
+        product_id: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> Iterator[Row]:
+        """
+        Stream TotalSales, Quantity and OrderCount grouped by any of CustomerID, ProductID and Period.
+
+        `start` and `end` are inclusive ISO dates, compared against the day or the first day of the month.
+        """
+        if grain not in ROLLUP_TABLES:
+            raise ValueError(f"Unknown grain {grain}, expected one of {list(ROLLUP_TABLES)}")
+        unknown_columns = set(group_by) - set(GROUP_BY_COLUMNS)
+        if unknown_columns:
+            raise ValueError(f"Cannot group by {sorted(unknown_columns)}, expected any of {list(GROUP_BY_COLUMNS)}")
+
+        filters = {
+            dimension_filter("CustomerID", "customer_id"): customer_id,
+            dimension_filter("ProductID", "product_id"): product_id,
+            "Period >= :start": start,
+            "Period <= :end": end,
+        }
+        where = " AND ".join(condition for condition, value in filters.items() if value is not None)
+
+        # NOTE: Quoted aliases keep the row keys in the same case on every DB, Postgres lower cases the rest
+        key_columns, aliased_columns, joins = [], "", ""
+        for column in group_by:
+            if column in DIMENSION_COLUMNS:
+                table, key_column = DIMENSION_COLUMNS[column]
+                key_columns.append(key_column)
+                aliased_columns += f'{table}.{column} AS "{column}", '
+                joins += f" JOIN {table} ON {table}.{key_column} = totals.{key_column}"
+            else:
+                key_columns.append(column)
+                aliased_columns += f'totals.{column} AS "{column}", '
+        group_keys = ", ".join(key_columns)
+        order_by = ", ".join(f'"{column}"' for column in group_by)
+
+        query = f"""
+            SELECT {aliased_columns}
+                totals.TotalSales AS "TotalSales", totals.Quantity AS "Quantity", totals.OrderCount AS "OrderCount"
+            FROM (
+                SELECT {group_keys + ", " if group_keys else ""}
+                    SUM(TotalSales) AS TotalSales, SUM(Quantity) AS Quantity, SUM(OrderCount) AS OrderCount
+                FROM {ROLLUP_TABLES[grain]}
+                {"WHERE " + where if where else ""}
+                {"GROUP BY " + group_keys if group_keys else ""}
+            ) totals{joins}
+            {"ORDER BY " + order_by if order_by else ""}
+        """
+        params = {"customer_id": customer_id, "product_id": product_id, "start": start, "end": end}
+        return self.db_adapter.stream_query(query, params=params, batch_size=self.batch_size)
+
+    def sales_by_customer(self, grain: str = "month", **filters) -> Iterator[Row]:
+        return self.sales_totals(group_by=("CustomerID", "Period"), grain=grain, **filters)
+
+    def sales_by_product(self, grain: str = "month", **filters) -> Iterator[Row]:
+        return self.sales_totals(group_by=("ProductID", "Period"), grain=grain, **filters)
+
+
+if __name__ == "__main__":
+    pass
@@ -1,9 +1,14 @@
 # External Imports
+import os
+import tempfile
 from enum import StrEnum, auto
 
 import pandas as pd
 from sanctify import Cleanser, Constants, DateOrderTuples, PrimitiveDataTypes, Transformer, process_cleansed_df
 
+# Internal Imports
+from adapters import BlobAdapter
+
 
 class MyCustomCleanser(Cleanser):
     def validate_total_amount(self):
@@ -168,6 +173,25 @@ def cleanse_and_validate(
         cleansed_processed_output_file_path, index=False)
 
 
+def cleanse_and_validate_blob(storage_adapter: BlobAdapter, input_file_name: str) -> str:
+    """Run `cleanse_and_validate` on a chunk held in shared storage and store the result next to it."""
+    transformed_file_name = f"transformed_{input_file_name}"
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_file_path = os.path.join(work_dir, input_file_name)
+        cleansed_processed_output_file_path = os.path.join(work_dir, transformed_file_name)
+        with open(input_file_path, "w") as f:
+            f.write(storage_adapter.read_data(input_file_name))
+
+        cleanse_and_validate(
+            input_file_path=input_file_path,
+            cleansed_processed_output_file_path=cleansed_processed_output_file_path,
+        )
+
+        with open(cleansed_processed_output_file_path, "rb") as f:
+            storage_adapter.save_data(transformed_file_name, f.read())
+    return transformed_file_name
+
+
 if __name__ == "__main__":
     # Step 1: Define file paths
     input_file_path = "<path to>/input.csv"
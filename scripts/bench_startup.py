@@ -0,0 +1,126 @@
+"""
+Compare start up time of the lazy imports against importing every backend up front.
+
+Usage: python scripts/bench_startup.py [--repeat 5] [--workers 4] [--start-method fork|spawn|forkserver]
+
+"eager" imports what main.py used to import at start up (every adapter backend, sanctify and pandas),
+"lazy" imports main.py as it is now, and preloads the worker modules before a forking pool like main.py does.
+
+Two things are timed, each in a fresh interpreter:
+  cold start     the CLI importing its start up modules
+  workers ready  the CLI imports, then a pool (with the platform's default start method unless given) whose
+                 workers each import what their real entry point imports before its first task
+                 (main.WORKER_MODULES): handle_transformation or run_coordinated_worker
+"""
+
+# External Imports
+import argparse
+import importlib
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+PIPELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "csv_pipeline")
+
+IMPORT_SETS = {
+    "eager": [
+        "main",
+        "adapters.blobs",
+        "adapters.queues",
+        "adapters.databases",
+        "boto3",
+        "pika",
+        "coordinator",
+        "loader",
+        "partitioned_loader",
+        "transformer",
+    ],
+    "lazy": ["main"],
+}
+
+# Pool worker entry points, see main.WORKER_MODULES
+WORKER_ENTRY_POINTS = ("transform", "coordinated")
+
+
+def import_modules(module_names: list[str]) -> int:
+    for module_name in module_names:
+        importlib.import_module(module_name)
+    return len(sys.modules)
+
+
+def run_timed(*args: str) -> float:
+    """Run this script with `args` in a fresh interpreter and return the seconds it reports."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), *args], cwd=PIPELINE_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def cold_start(import_set: str):
+    started_at = time.perf_counter()
+    import_modules(IMPORT_SETS[import_set])
+    print(time.perf_counter() - started_at)
+
+
+def workers_ready(import_set: str, entry: str, workers: int, start_method: str):
+    # NOTE: Under fork the workers inherit whatever the CLI imported, under spawn they start from scratch
+    import_modules(IMPORT_SETS[import_set])
+    pipeline_main = importlib.import_module("main")
+    multiprocessing.set_start_method(start_method, force=True)
+    started_at = time.perf_counter()
+    if import_set == "lazy":
+        pipeline_main.preload_worker_modules(entry)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(import_modules, [pipeline_main.WORKER_MODULES[entry]] * workers))
+    print(time.perf_counter() - started_at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--start-method", default=multiprocessing.get_start_method())
+    parser.add_argument("--cold-start", help=argparse.SUPPRESS)
+    parser.add_argument("--workers-ready", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, PIPELINE_DIR)  # Inherited by spawned workers
+    if args.cold_start:
+        return cold_start(args.cold_start)
+    if args.workers_ready:
+        return workers_ready(*args.workers_ready, workers=args.workers, start_method=args.start_method)
+
+    results = {}
+    for name in IMPORT_SETS:
+        cold_starts = [run_timed("--cold-start", name) for _ in range(args.repeat)]
+        ready = {
+            entry: statistics.median(
+                run_timed("--workers-ready", name, entry, "--workers", str(args.workers),
+                          "--start-method", args.start_method)
+                for _ in range(args.repeat)
+            )
+            for entry in WORKER_ENTRY_POINTS
+        }
+        results[name] = (statistics.median(cold_starts), ready)
+
+    ready_headers = "".join(f"{f'{entry} ready':>20}" for entry in WORKER_ENTRY_POINTS)
+    print(f"{args.workers} workers, {args.start_method} start method, median of {args.repeat}")
+    print(f"{'':<8}{'cold start':>14}{ready_headers}")
+    for name, (cold, ready) in results.items():
+        print(f"{name:<8}{cold * 1000:>12.0f}ms" + "".join(f"{ready[entry] * 1000:>18.0f}ms" for entry in ready))
+
+    (eager_cold, eager_ready), (lazy_cold, lazy_ready) = results["eager"], results["lazy"]
+    print(f"\ncold start {eager_cold / lazy_cold:.1f}x faster", end="")
+    for entry in WORKER_ENTRY_POINTS:
+        # Workers can't start their first task before the CLI has started the pool
+        eager_total, lazy_total = eager_cold + eager_ready[entry], lazy_cold + lazy_ready[entry]
+        print(f", CLI + {entry} workers ready {eager_total / lazy_total:.2f}x", end="")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+# External Imports
+import os
+import sys
+
+import pytest
+
+# NOTE: The pipeline modules import each other as top level modules, the same as when running csv_pipeline/main.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "csv_pipeline"))
+
+from config import Config  # noqa: E402
+
+
+@pytest.fixture
+def config(tmp_path) -> Config:
+    """Config for a throwaway SQLite file and filesystem store under tmp_path."""
+    config = Config()
+    config.DB_TYPE = "sqlite"
+    config.DB_URI = f"sqlite:///{tmp_path / 'sales_data.db'}"
+    config.STORAGE_TYPE = "filesystem"
+    config.LOCAL_STORAGE_PATH = str(tmp_path)
+    config.STORAGE_BASE_PATH = str(tmp_path)
+    return config
@@ -0,0 +1,97 @@
+# External Imports
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import text
+
+# Internal Imports
+from adapters import SQLiteAdapter
+from coordinator import DONE, FAILED, STAGES, ChunkCoordinator
+
+SOURCE_KEY = "large.csv"
+CHUNK_COUNT = 20
+WORKER_COUNT = 4
+
+
+def get_coordinator(config, lease_timeout: float = 60, max_attempts: int = 3) -> ChunkCoordinator:
+    return ChunkCoordinator(
+        db_adapter=SQLiteAdapter(config=config), lease_timeout=lease_timeout, max_attempts=max_attempts
+    )
+
+
+def seed_chunks(config, chunk_count: int = CHUNK_COUNT) -> ChunkCoordinator:
+    coordinator = get_coordinator(config)
+    coordinator.create_table()
+    coordinator.seed(SOURCE_KEY, [(index * 100, (index + 1) * 100) for index in range(chunk_count)])
+    return coordinator
+
+
+def chunk_stages(coordinator: ChunkCoordinator) -> dict[int, str]:
+    with coordinator.db_adapter.engine.connect() as connection:
+        return dict(connection.execute(text("SELECT ChunkIndex, Stage FROM ChunkLeases")).tuples().all())
+
+
+def run_worker(config) -> list[tuple[int, str]]:
+    """Lease and complete chunks until the source is finished, returns every (chunk, stage) this worker completed."""
+    coordinator = get_coordinator(config)
+    owner = f"worker-{os.getpid()}"
+    completed = []
+    while not coordinator.is_finished(SOURCE_KEY):
+        lease = coordinator.acquire(owner=owner)
+        if lease is None:
+            time.sleep(0.01)
+            continue
+        if coordinator.complete(lease, payload=f"{lease.stage}_{lease.chunk_index}.csv"):
+            completed.append((lease.chunk_index, lease.stage))
+    return completed
+
+
+def test_seed_is_idempotent(config):
+    coordinator = seed_chunks(config)
+    assert coordinator.seed(SOURCE_KEY, [(0, 100), (100, 200)]) == 0
+    assert chunk_stages(coordinator) == {index: STAGES[0] for index in range(CHUNK_COUNT)}
+
+
+def test_workers_complete_every_stage_exactly_once(config):
+    coordinator = seed_chunks(config)
+
+    with ProcessPoolExecutor(max_workers=WORKER_COUNT) as executor:
+        futures = [executor.submit(run_worker, config) for _ in range(WORKER_COUNT)]
+        completed = [chunk_stage for future in futures for chunk_stage in future.result()]
+
+    assert Counter(completed) == Counter((index, stage) for index in range(CHUNK_COUNT) for stage in STAGES)
+    assert chunk_stages(coordinator) == {index: DONE for index in range(CHUNK_COUNT)}
+
+
+def test_expired_lease_is_reassigned(config):
+    seed_chunks(config, chunk_count=1)
+    coordinator = get_coordinator(config, lease_timeout=0.1)
+
+    lease = coordinator.acquire(owner="crashed")
+    assert coordinator.acquire(owner="other") is None  # Still leased
+
+    time.sleep(0.3)
+    stolen = coordinator.acquire(owner="other")
+    assert (stolen.chunk_index, stolen.stage) == (lease.chunk_index, lease.stage)
+    assert stolen.attempts == lease.attempts + 1
+    assert stolen.token != lease.token
+
+    # The original holder finds out it lost the chunk
+    assert not coordinator.heartbeat(lease)
+    assert not coordinator.complete(lease, payload="chunk_0.csv")
+    assert coordinator.complete(stolen, payload="chunk_0.csv")
+    assert chunk_stages(coordinator) == {0: STAGES[1]}
+
+
+def test_chunk_fails_after_max_attempts(config):
+    seed_chunks(config, chunk_count=1)
+    coordinator = get_coordinator(config, max_attempts=2)
+
+    for _ in range(2):
+        coordinator.release(coordinator.acquire(owner="worker"), error="boom")
+
+    assert coordinator.acquire(owner="worker") is None
+    assert chunk_stages(coordinator) == {0: FAILED}
+    assert coordinator.is_finished(SOURCE_KEY)
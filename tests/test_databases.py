@@ -0,0 +1,65 @@
+# External Imports
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+# Internal Imports
+from adapters import SQLiteAdapter
+
+
+def test_refuses_a_sales_summary_without_surrogate_keys(config):
+    db_adapter = SQLiteAdapter(config=config)
+    with db_adapter.engine.begin() as connection:
+        connection.execute(text("CREATE TABLE SalesSummary (CustomerID TEXT, ProductID TEXT, TotalSales REAL)"))
+
+    with pytest.raises(RuntimeError, match="SalesSummary is missing SourceChunk, CustomerKey, ProductKey"):
+        db_adapter.create_tables()
+
+
+def test_partitions_only_take_their_own_month(config):
+    db_adapter = SQLiteAdapter(config=config)
+    db_adapter.create_tables()
+    partition = db_adapter.ensure_order_partition(date(2024, 2, 1))
+    order = {"OrderID": 1, "CustomerKey": 1, "ProductKey": 1, "Quantity": 1, "UnitPrice": 5.0, "TotalAmount": 5.0}
+
+    for order_date in ("2024-02-01", "2024-02-29"):
+        db_adapter.insert_orders(partition, [order | {"OrderID": order["OrderID"] + 1, "OrderDate": order_date}])
+        order["OrderID"] += 1
+    for order_date in ("2024-01-31", "2024-03-01"):
+        with pytest.raises(IntegrityError, match="CHECK constraint failed"):
+            db_adapter.insert_orders(partition, [order | {"OrderDate": order_date}])
+
+    assert db_adapter.execute_query("SELECT COUNT(*) FROM Orders")[0][0] == 2
+
+
+def test_drop_order_partitions_before_the_cutoff(config):
+    db_adapter = SQLiteAdapter(config=config)
+    db_adapter.create_tables()
+    for month in (11, 12):
+        db_adapter.ensure_order_partition(date(2023, month, 1))
+    for month in (1, 2):
+        db_adapter.ensure_order_partition(date(2024, month, 1))
+
+    # A partition is only dropped once its whole month is before the cutoff
+    assert db_adapter.drop_order_partitions_before(date(2024, 1, 15)) == ["Orders_202311", "Orders_202312"]
+
+    assert db_adapter.order_partitions == {"Orders_202401", "Orders_202402"}
+    assert db_adapter.execute_query("SELECT PartitionName FROM OrderPartitions ORDER BY 1") == [
+        ("Orders_202401",),
+        ("Orders_202402",),
+    ]
+    tables = db_adapter.execute_query("SELECT name FROM sqlite_master WHERE name LIKE 'Orders_%' AND type = 'table'")
+    assert sorted(tables) == [("Orders_202401",), ("Orders_202402",)]
+    assert db_adapter.execute_query("SELECT COUNT(*) FROM Orders")[0][0] == 0  # The view was rebuilt
+    assert db_adapter.drop_order_partitions_before(date(2024, 1, 15)) == []
+
+
+def test_refuses_an_unpartitioned_orders_table(config):
+    db_adapter = SQLiteAdapter(config=config)
+    with db_adapter.engine.begin() as connection:
+        connection.execute(text("CREATE TABLE Orders (OrderID INTEGER PRIMARY KEY, OrderDate DATE)"))
+
+    with pytest.raises(RuntimeError, match="Orders is an unpartitioned table"):
+        db_adapter.create_tables()
@@ -0,0 +1,75 @@
+# External Imports
+import numpy as np
+import pandas as pd
+import pytest
+from dimensions import DimensionCache
+
+# Internal Imports
+from adapters import SQLiteAdapter
+
+
+@pytest.fixture
+def db_adapter(config, monkeypatch) -> SQLiteAdapter:
+    """A fresh SQLite adapter that records the natural IDs of every ensure_dimension_keys call."""
+    db_adapter = SQLiteAdapter(config=config)
+    db_adapter.create_tables()
+    db_adapter.ensured_ids = []
+    ensure_dimension_keys = db_adapter.ensure_dimension_keys
+
+    def record_ensure_dimension_keys(dimension, natural_ids):
+        db_adapter.ensured_ids.append(sorted(natural_ids))
+        return ensure_dimension_keys(dimension, natural_ids)
+
+    monkeypatch.setattr(db_adapter, "ensure_dimension_keys", record_ensure_dimension_keys)
+    return db_adapter
+
+
+def test_warms_with_the_newest_keys(db_adapter):
+    stored_keys = db_adapter.ensure_dimension_keys("customer", ["C1", "C2", "C3", "C4"])
+    db_adapter.ensured_ids.clear()
+    cache = DimensionCache(db_adapter, "customer", max_size=3)
+
+    keys = cache.resolve(pd.Series(["C4", "C2"]))
+
+    assert keys.tolist() == [stored_keys["C4"], stored_keys["C2"]]
+    assert db_adapter.ensured_ids == []  # Both were warmed, nothing went to the DB
+    assert list(cache.surrogate_keys) == ["C3", "C2", "C4"]
+
+
+def test_only_unseen_ids_are_inserted_in_one_batch(db_adapter):
+    cache = DimensionCache(db_adapter, "product", max_size=10)
+
+    first = cache.resolve(pd.Series(["P1", "P2", "P1", "P2", "P1"]))
+    second = cache.resolve(pd.Series(["P3", "P1", "P3", "P4"]))
+
+    assert db_adapter.ensured_ids == [["P1", "P2"], ["P3", "P4"]]
+    stored_keys = dict(db_adapter.fetch_dimension_keys("product", limit=10))
+    assert first.tolist() == [stored_keys[natural_id] for natural_id in ["P1", "P2", "P1", "P2", "P1"]]
+    assert second.tolist() == [stored_keys[natural_id] for natural_id in ["P3", "P1", "P3", "P4"]]
+
+
+def test_evicts_the_least_recently_used_past_max_size(db_adapter):
+    cache = DimensionCache(db_adapter, "customer", max_size=2)
+
+    first_key = cache.resolve(pd.Series(["C1"]))[0]
+    cache.resolve(pd.Series(["C2"]))
+    cache.resolve(pd.Series(["C1"]))  # C2 is now the least recently used
+    cache.resolve(pd.Series(["C3"]))
+    assert list(cache.surrogate_keys) == ["C1", "C3"]
+
+    cache.resolve(pd.Series(["C2"]))
+    assert list(cache.surrogate_keys) == ["C3", "C2"]
+    assert db_adapter.ensured_ids == [["C1"], ["C2"], ["C3"], ["C2"]]
+    # An evicted ID is looked up again and keeps its key
+    assert cache.resolve(pd.Series(["C1"]))[0] == first_key
+
+
+def test_missing_ids_resolve_to_na(db_adapter):
+    cache = DimensionCache(db_adapter, "customer", max_size=10)
+
+    keys = cache.resolve(pd.Series(["C1", None, np.nan, "C2", pd.NA], index=[10, 11, 12, 13, 14]))
+
+    assert keys.dtype == "Int64"
+    assert keys.index.tolist() == [10, 11, 12, 13, 14]
+    assert keys.isna().tolist() == [False, True, True, False, True]
+    assert db_adapter.ensured_ids == [["C1", "C2"]]
@@ -0,0 +1,71 @@
+# External Imports
+import extractor
+import pytest
+from extractor import chunk_file_name, extract_byte_range, plan_byte_ranges
+from main import get_blob_adapter
+
+SOURCE_KEY = "large.csv"
+HEADER = b"OrderID,OrderDate,CustomerID,ProductID,Quantity,UnitPrice,TotalAmount\n"
+
+
+def make_body(row_count: int = 40) -> bytes:
+    # Rows of different lengths so the range ends land all over them
+    return b"".join(
+        f"{order_id},2024-01-{order_id % 28 + 1:02d},C{order_id ** 2},P{order_id % 7},{order_id % 3 + 1},2.50,"
+        f"{'7' * (order_id % 11)}\n".encode()
+        for order_id in range(row_count)
+    )
+
+
+def extract_all(storage_adapter, chunk_bytes: int) -> list[bytes]:
+    """Extract every planned range of the source and return each chunk's body, with the header checked off."""
+    bodies = []
+    for chunk_index, (byte_start, byte_end) in enumerate(plan_byte_ranges(storage_adapter, SOURCE_KEY, chunk_bytes)):
+        output_file = extract_byte_range(storage_adapter, SOURCE_KEY, chunk_index, byte_start, byte_end)
+        assert output_file == chunk_file_name(SOURCE_KEY, chunk_index)
+        chunk = storage_adapter.read_data(output_file).encode()
+        assert chunk.startswith(HEADER)
+        bodies.append(chunk[len(HEADER):])
+    return bodies
+
+
+@pytest.mark.parametrize("trailing_newline", [True, False])
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 64, 333, 1 << 20])
+def test_extracted_ranges_add_up_to_the_source(config, monkeypatch, trailing_newline, chunk_bytes):
+    # A window smaller than a row makes the line break search span several reads
+    monkeypatch.setattr(extractor, "line_scan_bytes", 5)
+    body = make_body() if trailing_newline else make_body().rstrip(b"\n")
+    storage_adapter = get_blob_adapter(config=config)
+    storage_adapter.save_data(SOURCE_KEY, HEADER + body)
+
+    bodies = extract_all(storage_adapter, chunk_bytes)
+
+    assert b"".join(bodies) == body
+    # Every row is whole in exactly one chunk
+    rows = [row for chunk_body in bodies for row in chunk_body.splitlines()]
+    assert rows == body.splitlines()
+
+
+def test_row_crossing_a_range_end_goes_to_the_range_it_starts_in(config):
+    body = b"1,first\n22,second\n333,third\n"
+    storage_adapter = get_blob_adapter(config=config)
+    storage_adapter.save_data(SOURCE_KEY, HEADER + body)
+
+    # The first range ends inside "22,second", which starts in it, the second range starts inside it
+    first_range_end = len(HEADER) + body.index(b"second")
+    extract_byte_range(storage_adapter, SOURCE_KEY, 0, len(HEADER), first_range_end)
+    extract_byte_range(storage_adapter, SOURCE_KEY, 1, first_range_end, len(HEADER) + len(body))
+
+    assert storage_adapter.read_data(chunk_file_name(SOURCE_KEY, 0)).encode() == HEADER + b"1,first\n22,second\n"
+    assert storage_adapter.read_data(chunk_file_name(SOURCE_KEY, 1)).encode() == HEADER + b"333,third\n"
+
+
+def test_header_only_file_has_no_ranges(config):
+    storage_adapter = get_blob_adapter(config=config)
+    storage_adapter.save_data(SOURCE_KEY, HEADER)
+    assert plan_byte_ranges(storage_adapter, SOURCE_KEY, 64) == []
+
+
+def test_chunks_of_different_sources_do_not_collide():
+    assert chunk_file_name("a/large.csv", 0) != chunk_file_name("a_large.csv", 0)
+    assert "/" not in chunk_file_name("exports/2024/large.csv", 3)
@@ -0,0 +1,68 @@
+# External Imports
+from datetime import date
+
+import pandas as pd
+from loader import LOADED, LOGGED, DataLoader
+from main import get_blob_adapter
+
+# Internal Imports
+from adapters import SQLiteAdapter
+
+
+def make_orders(order_dates: list[str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "OrderID": [str(order_id) for order_id in range(1, len(order_dates) + 1)],
+            "OrderDate": order_dates,
+            "CustomerID": "C1",
+            "ProductID": "P1",
+            "Quantity": "1",
+            "UnitPrice": "5.00",
+            "TotalAmount": "5.00",
+        }
+    )
+
+
+def get_loader(config) -> DataLoader:
+    db_adapter = SQLiteAdapter(config=config)
+    db_adapter.create_tables()
+    return DataLoader(storage_adapter=get_blob_adapter(config=config), db_adapter=db_adapter)
+
+
+def partition_order_ids(db_adapter: SQLiteAdapter) -> dict[str, list[int]]:
+    partitions = db_adapter.execute_query("SELECT PartitionName FROM OrderPartitions ORDER BY PartitionName")
+    return {
+        partition: [order_id for order_id, in db_adapter.execute_query(f"SELECT OrderID FROM {partition} ORDER BY 1")]
+        for partition, in partitions
+    }
+
+
+def test_orders_are_routed_to_their_month(config):
+    loader = get_loader(config)
+
+    outcomes = loader.process_dataframe(
+        make_orders(["2024-01-31", "2024-02-01", "2023-12-15", "2024-02-29", "not a date", "2024-01-01"])
+    )
+
+    assert outcomes.tolist() == [LOADED, LOADED, LOADED, LOADED, LOGGED, LOADED]
+    assert partition_order_ids(loader.db_adapter) == {
+        "Orders_202312": [3],
+        "Orders_202401": [1, 6],
+        "Orders_202402": [2, 4],
+    }
+    assert loader.db_adapter.execute_query("SELECT COUNT(*) FROM Orders")[0][0] == 5
+
+
+def test_partition_dropped_under_the_cache_is_created_again(config, tmp_path):
+    loader = get_loader(config)
+    loader.process_dataframe(make_orders(["2024-01-10"]))
+    assert "Orders_202401" in loader.db_adapter.order_partitions
+
+    # Another node's retention purge drops the month this loader still has cached
+    SQLiteAdapter(config=config).drop_order_partitions_before(date(2024, 2, 1))
+
+    outcomes = loader.process_dataframe(make_orders(["2024-01-20", "2024-01-21"]))
+
+    assert outcomes.tolist() == [LOADED, LOADED]
+    assert partition_order_ids(loader.db_adapter) == {"Orders_202401": [1, 2]}
+    assert not list(tmp_path.glob("error_log_*"))
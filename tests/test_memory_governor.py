@@ -0,0 +1,91 @@
+# External Imports
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from memory_governor import FlushListener, MemoryGovernor, get_chunk_slots, install_chunk_slots
+
+TIMEOUT_SECONDS = 5
+
+
+def wait_until(predicate, timeout: float = TIMEOUT_SECONDS) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def wait_for_forced_flush(timeout: float) -> bool:
+    flushed = threading.Event()
+    flush_listener = FlushListener(chunk_slots=get_chunk_slots(), callback=flushed.set, interval=0.05)
+    flush_listener.start()
+    try:
+        return flushed.wait(timeout)
+    finally:
+        flush_listener.stop()
+
+
+def test_governor_throttles_under_a_tiny_budget():
+    governor = MemoryGovernor(budget_bytes=1, max_in_flight=4, interval=0.05)
+    flushed = threading.Event()
+    governor.register_flush(flushed.set)
+    chunk_slots = governor.chunk_slots
+
+    governor.start()
+    try:
+        assert flushed.wait(TIMEOUT_SECONDS)
+        assert wait_until(lambda: chunk_slots.limit == 1)
+
+        chunk_slots.acquire()
+        acquired = threading.Event()
+        waiter = threading.Thread(target=lambda: (chunk_slots.acquire(), acquired.set()))
+        waiter.start()
+        assert not acquired.wait(0.3)  # The only slot is taken
+
+        chunk_slots.release()
+        assert acquired.wait(TIMEOUT_SECONDS)
+        waiter.join()
+        chunk_slots.release()
+    finally:
+        governor.stop()
+
+    report = governor.report()
+    assert report["forced_flushes"] > 0
+    assert report["min_in_flight"] == 1
+    assert report["throttled_seconds"] > 0
+
+
+def test_forced_flush_reaches_pool_workers():
+    governor = MemoryGovernor(budget_bytes=1, max_in_flight=4, interval=0.05)
+    with ProcessPoolExecutor(
+        max_workers=2, initializer=install_chunk_slots, initargs=(governor.chunk_slots,)
+    ) as executor:
+        futures = [executor.submit(wait_for_forced_flush, TIMEOUT_SECONDS) for _ in range(2)]
+        governor.start()
+        try:
+            assert all(future.result() for future in futures)
+        finally:
+            governor.stop()
+
+
+def test_no_budget_leaves_chunks_uncapped():
+    governor = MemoryGovernor(budget_bytes=0, max_in_flight=2, interval=0.05)
+    chunk_slots = governor.chunk_slots
+    acquired = threading.Event()
+
+    def acquire_past_the_limit():
+        for _ in range(16):
+            chunk_slots.acquire()
+        acquired.set()
+
+    governor.start()
+    try:
+        threading.Thread(target=acquire_past_the_limit, daemon=True).start()
+        assert acquired.wait(TIMEOUT_SECONDS)
+    finally:
+        governor.stop()
+
+    assert chunk_slots.in_flight == 16
+    assert governor.report()["throttled_seconds"] < 1
@@ -0,0 +1,77 @@
+# External Imports
+import os
+
+import pandas as pd
+import pytest
+from loader import LOADED, LOGGED
+from main import get_blob_adapter, get_db_adapter, get_loader
+from partitioned_loader import PartitionedLoader, check_partition_coverage
+
+SHARD_COUNT = 3
+ORDER_COUNT = 300
+
+
+def make_orders(order_count: int = ORDER_COUNT) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "OrderID": range(1, order_count + 1),
+            "OrderDate": [f"2024-{order_id % 12 + 1:02d}-15" for order_id in range(order_count)],
+            "CustomerID": [f"C{order_id % 41:03d}" for order_id in range(order_count)],
+            "ProductID": [f"P{order_id % 7:03d}" for order_id in range(order_count)],
+            "Quantity": "2",
+            "UnitPrice": "5.00",
+            "TotalAmount": "10.00",
+        }
+    )
+
+
+@pytest.fixture
+def sharded_config(config, tmp_path):
+    config.LOADER_WORKERS = SHARD_COUNT
+    config.LOADER_SHARD_URI_TEMPLATE = f"sqlite:///{tmp_path / 'sales_data_shard_{shard}.db'}"
+    return config
+
+
+def test_chunk_loads_across_disjoint_shards(sharded_config, tmp_path):
+    orders = make_orders()
+    storage_adapter = get_blob_adapter(config=sharded_config)
+    storage_adapter.save_data("transformed_chunk_0.csv", orders.to_csv(index=False).encode("utf-8"))
+
+    loader = get_loader(
+        config=sharded_config, storage_adapter=storage_adapter, db_adapter=get_db_adapter(config=sharded_config)
+    )
+    assert isinstance(loader, PartitionedLoader)
+    loader.process_file(file_name_with_path="transformed_chunk_0.csv")
+    loader.close()
+
+    shard_customers = []
+    order_count = 0
+    for shard in range(SHARD_COUNT):
+        db_adapter = get_db_adapter(
+            config=sharded_config, db_uri=sharded_config.LOADER_SHARD_URI_TEMPLATE.format(shard=shard)
+        )
+        order_count += db_adapter.execute_query("SELECT COUNT(*) FROM Orders")[0][0]
+        shard_customers.append(
+            {
+                customer_id
+                for customer_id, in db_adapter.execute_query(
+                    "SELECT DISTINCT CustomerID FROM Orders JOIN DimCustomer USING (CustomerKey)"
+                )
+            }
+        )
+
+    assert order_count == ORDER_COUNT
+    assert set().union(*shard_customers) == set(orders["CustomerID"])
+    assert sum(len(customers) for customers in shard_customers) == orders["CustomerID"].nunique()
+    assert not os.path.exists(tmp_path / "transformed_chunk_0.csv")
+
+
+def test_partition_coverage_needs_every_row_once():
+    data = pd.DataFrame({"OrderID": range(4)})
+    outcomes = [pd.Series([LOADED, LOGGED], index=[0, 2]), pd.Series([LOADED, LOADED], index=[1, 3])]
+    check_partition_coverage(data, outcomes)
+
+    with pytest.raises(ValueError, match="reported 2 rows for 4"):
+        check_partition_coverage(data, outcomes[:1])
+    with pytest.raises(ValueError, match="neither loaded nor logged"):
+        check_partition_coverage(data, [outcomes[0], pd.Series([LOADED, None], index=[1, 3])])
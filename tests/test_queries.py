@@ -0,0 +1,112 @@
+# External Imports
+from itertools import combinations
+
+import pandas as pd
+import pytest
+from config import Config
+from main import get_blob_adapter, get_db_adapter, get_loader
+from queries import GROUP_BY_COLUMNS, SalesQueries
+
+ORDER_COUNT = 400
+PERIOD_FORMATS = {"day": "%Y-%m-%d", "month": "%Y-%m-01"}
+
+
+def make_orders(order_count: int = ORDER_COUNT) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "OrderID": [str(order_id) for order_id in range(1, order_count + 1)],
+            "OrderDate": [f"2024-{order_id % 3 + 1:02d}-{order_id % 5 + 10}" for order_id in range(order_count)],
+            "CustomerID": [f"C{order_id % 6}" for order_id in range(order_count)],
+            "ProductID": [f"P{order_id % 4}" for order_id in range(order_count)],
+            "Quantity": [str(order_id % 3 + 1) for order_id in range(order_count)],
+            "UnitPrice": "2.50",
+            "TotalAmount": [f"{(order_id % 3 + 1) * 2.5:.2f}" for order_id in range(order_count)],
+        }
+    )
+
+
+def expected_totals(orders: pd.DataFrame, group_by: tuple[str, ...], grain: str) -> list[tuple]:
+    orders = orders.assign(
+        Period=pd.to_datetime(orders["OrderDate"]).dt.strftime(PERIOD_FORMATS[grain]),
+        Quantity=orders["Quantity"].astype(float),
+        TotalAmount=orders["TotalAmount"].astype(float),
+    )
+    if not group_by:
+        return [(orders["TotalAmount"].sum(), orders["Quantity"].sum(), len(orders))] if len(orders) else []
+    totals = (
+        orders.groupby(list(group_by))
+        .agg(TotalSales=("TotalAmount", "sum"), Quantity=("Quantity", "sum"), OrderCount=("OrderID", "count"))
+        .reset_index()
+        .sort_values(list(group_by))
+    )
+    return list(totals.itertuples(index=False, name=None))
+
+
+@pytest.fixture(scope="module")
+def loaded(tmp_path_factory):
+    """Two overlapping chunks loaded into a throwaway SQLite file, and the orders they held."""
+    tmp_path = tmp_path_factory.mktemp("queries")
+    config = Config()
+    config.DB_TYPE = "sqlite"
+    config.DB_URI = f"sqlite:///{tmp_path / 'sales_data.db'}"
+    config.STORAGE_TYPE = "filesystem"
+    config.LOCAL_STORAGE_PATH = str(tmp_path)
+    config.STORAGE_BASE_PATH = str(tmp_path)
+
+    db_adapter = get_db_adapter(config=config)
+    db_adapter.create_tables()
+    loader = get_loader(config=config, storage_adapter=get_blob_adapter(config=config), db_adapter=db_adapter)
+    orders = make_orders()
+    for chunk in (orders[: ORDER_COUNT // 2], orders[ORDER_COUNT // 2:]):
+        loader.process_dataframe(chunk)
+    return SalesQueries(db_adapter, batch_size=7), db_adapter, orders
+
+
+def test_rollups_add_up_to_the_loaded_orders(loaded):
+    _, db_adapter, orders = loaded
+    for table in ("SalesRollupDaily", "SalesRollupMonthly"):
+        total_sales, quantity, order_count = db_adapter.execute_query(
+            f"SELECT SUM(TotalSales), SUM(Quantity), SUM(OrderCount) FROM {table}"
+        )[0]
+        assert total_sales == orders["TotalAmount"].astype(float).sum()
+        assert quantity == orders["Quantity"].astype(float).sum()
+        assert order_count == ORDER_COUNT
+
+
+@pytest.mark.parametrize("grain", ["day", "month"])
+@pytest.mark.parametrize(
+    "group_by", [group_by for size in range(4) for group_by in combinations(GROUP_BY_COLUMNS, size)]
+)
+def test_sales_totals_for_every_grouping(loaded, group_by, grain):
+    sales_queries, _, orders = loaded
+    rows = [tuple(row) for row in sales_queries.sales_totals(group_by=group_by, grain=grain)]
+    assert rows == expected_totals(orders, group_by, grain)
+
+
+def test_sales_totals_filters(loaded):
+    sales_queries, _, orders = loaded
+    order_dates = pd.to_datetime(orders["OrderDate"])
+
+    rows = [tuple(row) for row in sales_queries.sales_by_customer(grain="day", customer_id="C1", product_id="P3")]
+    matching = orders[(orders["CustomerID"] == "C1") & (orders["ProductID"] == "P3")]
+    assert rows and rows == expected_totals(matching, ("CustomerID", "Period"), "day")
+
+    # Both bounds are inclusive
+    rows = [tuple(row) for row in sales_queries.sales_by_product(grain="day", start="2024-02-11", end="2024-03-10")]
+    matching = orders[(order_dates >= "2024-02-11") & (order_dates <= "2024-03-10")]
+    assert rows and rows == expected_totals(matching, ("ProductID", "Period"), "day")
+
+    rows = [
+        tuple(row) for row in sales_queries.sales_totals(group_by=("Period",), start="2024-02-01", end="2024-02-01")
+    ]
+    assert rows == expected_totals(orders[order_dates.dt.month == 2], ("Period",), "month")
+
+    assert list(sales_queries.sales_totals(customer_id="unknown")) == []
+
+
+def test_sales_totals_rejects_unknown_grain_and_columns(loaded):
+    sales_queries, _, _ = loaded
+    with pytest.raises(ValueError, match="Unknown grain week"):
+        sales_queries.sales_totals(grain="week")
+    with pytest.raises(ValueError, match="Cannot group by"):
+        sales_queries.sales_totals(group_by=("OrderID",))
@@ -0,0 +1,78 @@
+# External Imports
+import os
+import subprocess
+import sys
+import textwrap
+from importlib.metadata import EntryPoint
+
+import pytest
+
+# Internal Imports
+import adapters.registry
+from adapters.registry import DB_ADAPTERS, AdapterRegistry
+
+PIPELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "csv_pipeline")
+ENTRY_POINT_GROUP = "csv_pipeline.test_adapters"
+
+
+@pytest.fixture
+def adapter_module(tmp_path, monkeypatch) -> str:
+    """Name of a throwaway, not yet imported module holding an adapter class called TestAdapter."""
+    module_name = f"test_adapter_{tmp_path.name}"
+    (tmp_path / f"{module_name}.py").write_text("class TestAdapter:\n    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield module_name
+    sys.modules.pop(module_name, None)
+
+
+def test_builtins_are_imported_on_first_resolve():
+    # NOTE: A fresh interpreter, the rest of the suite has imported every backend into this one already
+    script = textwrap.dedent(
+        """
+        import sys
+        import main
+        from adapters import DB_ADAPTERS, QUEUE_ADAPTERS
+
+        assert "adapters.queues" not in sys.modules and "adapters.databases" not in sys.modules
+        assert QUEUE_ADAPTERS.resolve("in_memory").__name__ == "InMemQueueAdapter"
+        assert "adapters.queues" in sys.modules and "adapters.databases" not in sys.modules
+        assert DB_ADAPTERS.resolve("sqlite").__name__ == "SQLiteAdapter"
+        """
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=PIPELINE_DIR, check=True)
+
+
+def test_entry_points_are_discovered(adapter_module, monkeypatch):
+    discovered = [
+        EntryPoint(name="mysql", value=f"{adapter_module}:TestAdapter", group=ENTRY_POINT_GROUP),
+        EntryPoint(name="sqlite", value=f"{adapter_module}:TestAdapter", group=ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(
+        adapters.registry, "entry_points", lambda group: discovered if group == ENTRY_POINT_GROUP else []
+    )
+    registry = AdapterRegistry(
+        kind="test", entry_point_group=ENTRY_POINT_GROUP, builtins={"sqlite": "adapters.databases:SQLiteAdapter"}
+    )
+
+    assert registry.names() == ["mysql", "sqlite"]
+    assert adapter_module not in sys.modules  # Listing the names only reads the metadata
+    assert registry.resolve("mysql") is sys.modules[adapter_module].TestAdapter
+    assert registry.resolve("sqlite") is DB_ADAPTERS.resolve("sqlite")  # A built in wins over an entry point
+
+
+def test_register_a_class_or_a_path(adapter_module):
+    registry = AdapterRegistry(kind="test", entry_point_group=ENTRY_POINT_GROUP, builtins={})
+
+    registry.register("lazy", f"{adapter_module}:TestAdapter")
+    assert adapter_module not in sys.modules
+    adapter_class = registry.resolve("lazy")
+    assert adapter_class.__name__ == "TestAdapter"
+
+    registry.register("eager", adapter_class)
+    assert registry.resolve("eager") is adapter_class
+    assert registry.names() == ["eager", "lazy"]
+
+
+def test_unknown_name_lists_the_available_adapters():
+    with pytest.raises(KeyError, match=r"Unknown db adapter 'mysql', available: \['postgres', 'sqlite'\]"):
+        DB_ADAPTERS.resolve("mysql")